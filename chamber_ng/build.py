@@ -230,14 +230,15 @@ class ChamberNG(object):
         """replicates something centered on the points list cps"""
         c = type(self)  # this class
         cps = c.grid2dtolist(*cpg)  # list of points for centers
-        return CQ().pushPoints(cps).eachpoint(lambda loc: thing.val().moved(loc), True)
+        return CQ(tb.u.place(thing.val(), cps))
 
     def make_endblock(self):
         """builds one endblock"""
         co = "CenterOfBoundBox"
 
         block_width = self.substrate_adapters[0] - self.pcb_thickness - 2 * self.spacer_h
-        base = CQ().box(block_width, self.eb_thickness_shelf, self.wall_height, centered=(True, False, False))
+        # memoized up to the lock nut slots (see tb.memo), so an unchanged endblock comes straight from the cache
+        base = tb.memo.memo(CQ()).box(block_width, self.eb_thickness_shelf, self.wall_height, centered=(True, False, False))
         # drill the mounting hole
         base = base.faces("<Z[-1]").workplane(centerOption=co).hole(tb.c.std_screw_threads["m5"]["close_r"] * 2)
         # make upper PCB mount holes
@@ -248,14 +249,14 @@ class ChamberNG(object):
         base = base.faces("<X[-1]").workplane(centerOption=co).center(self.eb_thickness_shelf / 2 - self.pcb_mount_hole_offset, -self.wall_height / 2 + self.pcb_mount_hole_offset + self.pcb_z_float).circle(self.pcb_alignment_hole_d / 2).cutBlind(-self.pcb_alignment_hole_depth)
 
         # the endblock extension chunk that reaches furthest towards the middle
-        extension_a = CQ().box(block_width, self.eb_thickness_extension, self.pcb_min_height, centered=(True, False, False))
+        extension_a = tb.memo.memo(CQ()).box(block_width, self.eb_thickness_extension, self.pcb_min_height, centered=(True, False, False))
         extension_a = extension_a.translate((0, self.eb_thickness_shelf, self.pcb_z_float + self.pcb_bottom_bump_down))
 
         b_width = self.pcb_bottom_bump_offset - self.eb_thickness_shelf
         b_height = self.pcb_height - self.pcb_top_bump_up
 
         # the endblock extension chunk that floats just above the shelf
-        extension_b = CQ().box(block_width, b_width, b_height, centered=(True, False, False))
+        extension_b = tb.memo.memo(CQ()).box(block_width, b_width, b_height, centered=(True, False, False))
         extension_b = extension_b.translate((0, self.eb_thickness_shelf, self.pcb_z_float))
 
         # make lower PCB mount holes
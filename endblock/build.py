@@ -4,7 +4,7 @@ import geometrics.toolbox as tb
 import pathlib
 
 def main():
-    block = tb.endblock.build(horzm3s=True, align_bumps=True, special_chamfer=1.6)
+    block = tb.endblock.build(horzm3s=True, align_bumps=True, special_chamfer=1.6).block
     
     if "show_object" in globals():
         show_object(block)
@@ -32,6 +32,20 @@ def main():
     chamf_major = 1
     chamf_minor = 0.5
 
+    # the STEP files (in the components folder) of the bought parts
+    component_files = {
+        "flange": "SM05F1-Step.step",
+        "fiber_adapter": "SM05SMA-Step.step",
+        "lockring": "SM05RR-Step.step",
+        "big_pin": "S25-022+P25-4023.step",
+        "small_pin": "P13-4023+S13-503.step",
+        "joe_header_stack": "877581017+511101060.stp",
+        "hoye12_header_stack": "702461602.stp",
+        "idc_header_stack": "SFH213-PPPC-D06-ID-BK+HIF3FB-16DA-2.54DSA(71).step",
+        "short_coupler": "Download_STEP_970150611 (rev1).stp",
+        "long_coupler": "Download_STEP_970200611 (rev1).stp",
+    }
+
     def mk_flange_bit(drawings: dict[str, Path], components_dir: Path, flange_base_height: float, thickness: float, whole_width: float) -> tuple[cq.Solid | cq.Compound, cq.Assembly]:
         """build the flange bit"""
         hardware = cq.Assembly()  # this being empty causes a warning on output
@@ -51,20 +65,20 @@ def main():
 
         wp = cq.Workplane().add(base.translate((0, 0, -thickness - flange_base_height)))
 
-        flange = u.import_step(components_dir / "SM05F1-Step.step")
+        flange = u.import_step(components_dir / component_files["flange"])
         if flange:
             flange = flange.findSolid().translate((0, 0, 10.0076))
             flange_screw_space = 0.9144
             hardware.add(flange, name="flange")
 
         adapter_shift = 10.0076 - 3.175  # shift the hardware to the top of the flange
-        fiber_adapter = u.import_step(components_dir / "SM05SMA-Step.step")
+        fiber_adapter = u.import_step(components_dir / component_files["fiber_adapter"])
         if fiber_adapter:
             fiber_adapter = fiber_adapter.findSolid().rotate((0, 0, 0), (0, 1, 0), 90).translate((7.1746, 10.8567, 29.16169 + adapter_shift))
             hardware.add(cq.Assembly(fiber_adapter), name="adapter")
 
         ring_shift = 5.18  # put ring under adapter
-        ring = u.import_step(components_dir / "SM05RR-Step.step").findSolid().rotate((0, 0, 0), (0, 1, 0), 180).translate((0, 0, 0.82550 + ring_shift))
+        ring = u.import_step(components_dir / component_files["lockring"]).findSolid().rotate((0, 0, 0), (0, 1, 0), 180).translate((0, 0, 0.82550 + ring_shift))
         hardware.add(cq.Assembly(ring), name="lockring")
 
         flange_screw_length = thickness
@@ -134,7 +148,7 @@ def main():
             sleeve_length = 18.50  # length before bottom taper
             total_sleeve_length = 23.7
             drill_diameter = 1.75
-            pin = u.import_step(components_dir / "S25-022+P25-4023.step").findSolid().rotate((0, 0, 0), (1, 0, 0), 90)
+            pin = u.import_step(components_dir / component_files["big_pin"]).findSolid().rotate((0, 0, 0), (1, 0, 0), 90)
             pin_nom_offset = head_length + (1 - pin_nominal_frac) * pin_travel
             pin = pin.translate((0, 0, -pin_nom_offset))
             void_head_offset = 0.2  # make the pin void diameter this much larger than that of the pin head
@@ -154,7 +168,7 @@ def main():
             total_sleeve_length = 17.75
             drill_diameter = 0.95
 
-            pin = u.import_step(components_dir / "P13-4023+S13-503.step").findSolid().rotate((0, 0, 0), (1, 0, 0), 90)
+            pin = u.import_step(components_dir / component_files["small_pin"]).findSolid().rotate((0, 0, 0), (1, 0, 0), 90)
             pin_nom_offset = head_length + (1 - pin_nominal_frac) * pin_travel
             pin = pin.translate((0, 0, -pin_nom_offset))
             void_head_offset = 0.2  # make the upper pin void diameter this much larger than that of the pin head
@@ -405,15 +419,15 @@ def main():
             if (version == "joe") or (version == "hoye12"):
                 if version == "joe":
                     # add in the pin header and connector stack, for use with cable assembly part number 2185091101
-                    header_stack = u.import_step(components_dir / "877581017+511101060.stp").findSolid().translate((0, 0, -1.5))
+                    header_stack = u.import_step(components_dir / component_files["joe_header_stack"]).findSolid().translate((0, 0, -1.5))
                     hardware.add(header_stack.located(cq.Location((0, +major_spacing / 2, -holder_base_height - pcbt))))
                     hardware.add(header_stack.located(cq.Location((0, -major_spacing / 2, -holder_base_height - pcbt))))
                 elif version == "hoye12":
-                    header_stack = u.import_step(components_dir / "702461602.stp").findSolid().rotate((0, 0, 0), (1, 0, 0), -90).translate((0, 0, -5.71))
+                    header_stack = u.import_step(components_dir / component_files["hoye12_header_stack"]).findSolid().rotate((0, 0, 0), (1, 0, 0), -90).translate((0, 0, -5.71))
                     hardware.add(header_stack.located(cq.Location((0, 0, -holder_base_height - pcbt))))
             else:
                 # add in the header and IDC connector stack
-                header_stack = u.import_step(components_dir / "SFH213-PPPC-D06-ID-BK+HIF3FB-16DA-2.54DSA(71).step").findSolid().rotate((0, 0, 0), (1, 0, 0), -180)
+                header_stack = u.import_step(components_dir / component_files["idc_header_stack"]).findSolid().rotate((0, 0, 0), (1, 0, 0), -180)
 
                 hardware.add(header_stack.located(cq.Location((0, +2 * 2.54, -holder_base_height - pcbt))))
                 hardware.add(header_stack.located(cq.Location((0, -2 * 2.54, -holder_base_height - pcbt))))
@@ -432,10 +446,10 @@ def main():
         c_diameter = c_flat_to_flat / (math.cos(math.tanh(1 / math.sqrt(3))))
         if (version == "joe") or (version == "hoye12"):
             coupler_len = 15
-            coupler = u.import_step(components_dir / "Download_STEP_970150611 (rev1).stp").findSolid().translate((0, 0, -coupler_len / 2))
+            coupler = u.import_step(components_dir / component_files["short_coupler"]).findSolid().translate((0, 0, -coupler_len / 2))
         else:
             coupler_len = 20
-            coupler = u.import_step(components_dir / "Download_STEP_970200611 (rev1).stp").findSolid().translate((0, 0, -coupler_len / 2))
+            coupler = u.import_step(components_dir / component_files["long_coupler"]).findSolid().translate((0, 0, -coupler_len / 2))
 
         if version == "yen":
             rarray_args = (pusher_mount_spacing, 1, 2, 1)
@@ -486,6 +500,9 @@ def main():
 
         return out
 
+    # parse the component STEP files up front in parallel so the import_step calls that follow hit the cache
+    u.import_steps([wrk_dir / "components" / component_file for component_file in component_files.values()])
+
     # make the pieces
     holder_parts = mk_single_holder(drawings=drawings, components_dir=wrk_dir / "components")
     holder = holder_parts["holder"]
@@ -128,22 +128,23 @@ assembly.extend(adapter.translate((adapter_spacing, 0, 0)).vals())
 assembly.extend(adapter.translate((-adapter_spacing, 0, 0)).vals())
 
 # build an endblock
-block = tb.endblock.build(adapter_width=adapter_width, horzm3s=False, pfdowel=True)
+endblock = tb.endblock.build(adapter_width=adapter_width, horzm3s=False, pfdowel=True)
+block = endblock.block
 
 # position the block
-block = block.translate((tb.endblock.length/2+block_offset_from_edge_of_base, base_w/2, tb.endblock.height/2+base_t))
+block = block.translate((endblock.length/2+block_offset_from_edge_of_base, base_w/2, endblock.height/2+base_t))
 
 assembly.extend(block.vals())
 assembly.extend(block.mirror('ZY', (base_l/2, 0, 0)).vals())
 
 # build the sandwich
-s = sandwich.Sandwich(tb, leng=base_l, wid=base_w, substrate_xy_nominal=adapter_dim, cutout_spacing=adapter_spacing, endblock_width=tb.endblock.length, aux_hole_spacing=tb.endblock.aux_hole_spacing, block_offset_from_edge_of_base=block_offset_from_edge_of_base)
+s = sandwich.Sandwich(tb, leng=base_l, wid=base_w, substrate_xy_nominal=adapter_dim, cutout_spacing=adapter_spacing, endblock_width=endblock.length, aux_hole_spacing=tb.endblock.aux_hole_spacing, block_offset_from_edge_of_base=block_offset_from_edge_of_base)
 holder = s.build()
-holder = holder.translate((base_l/2, base_w/2, tb.endblock.height+base_t))
+holder = holder.translate((base_l/2, base_w/2, endblock.height+base_t))
 assembly.extend(holder.Solids())
 
 # drill mounting holes in base
-block_mount_hole_center_offset_from_edge = block_offset_from_edge_of_base + tb.endblock.length/2
+block_mount_hole_center_offset_from_edge = block_offset_from_edge_of_base + endblock.length/2
 block_mount_hole_x = base_l/2-block_mount_hole_center_offset_from_edge
 # cbore holes for use with RS flangenut Stock No. 725-9650
 base = base.faces("<Z").workplane(centerOption='CenterOfBoundBox').center(block_mount_hole_x, 0).cboreHole(2*tb.c.std_screw_threads["m5"]["close_r"], cboreDiameter=tb.c.cbore_dia, cboreDepth=tb.c.cbore_depth, clean=True)
@@ -112,22 +112,21 @@ adapter = chamber.adapter
 adapter_width = chamber.adapter_width
 
 # build an alignment endblock
-ablock = tb.endblock.build(adapter_width=adapter_width, horzm3s=True, align_bumps=True, special_chamfer=1.6)
-ablock = to_holder(ablock, chamber_floor)
-ablock = ablock.translate((0, tb.endblock.height / 2, 0))
+endblock = tb.endblock.build(adapter_width=adapter_width, horzm3s=True, align_bumps=True, special_chamfer=1.6)
+ablock = to_holder(endblock.block, chamber_floor)
+ablock = ablock.translate((0, endblock.height / 2, 0))
 
 # build the aligner
 ac = aligner.Aligner(tb)
 al = ac.build()
 al = to_holder(al, chamber_floor)
-al = al.translate((0, tb.endblock.height, 0))
+al = al.translate((0, endblock.height, 0))
 al = al.rotate((0, 0, 0), (0, 1, 0), -90)
 ablock.add(al)  # put them on the same workplane
 
-# build an endblock
-block = tb.endblock.build(adapter_width=adapter_width, horzm3s=True, align_bumps=True, special_chamfer=1.6)
-block = to_holder(block, chamber_floor)
-block = block.translate((0, tb.endblock.height / 2, 0))
+# an endblock (identical to the alignment one, before the aligner was added to that)
+block = to_holder(endblock.block, chamber_floor)
+block = block.translate((0, endblock.height / 2, 0))
 
 gas_plate_thickness = 2  # thickness of the plate we'll use to redirect the gas
 block_scrunch = 5.8  # move the blocks a further amount towards the center
@@ -135,7 +134,7 @@ blockA = block.translate(
     (
         0,
         0,
-        holder_along_z / 2 - gas_plate_thickness - block_scrunch - tb.endblock.length / 2,
+        holder_along_z / 2 - gas_plate_thickness - block_scrunch - endblock.length / 2,
     )
 )
 blockB = blockA.mirror("XY", (0, 0, 0))
@@ -143,7 +142,7 @@ ablockA = ablock.translate(
     (
         0,
         0,
-        holder_along_z / 2 - gas_plate_thickness - block_scrunch - tb.endblock.length / 2,
+        holder_along_z / 2 - gas_plate_thickness - block_scrunch - endblock.length / 2,
     )
 )
 ablockB = ablockA.rotate((0, 0, 0), (0, 1, 0), 180)
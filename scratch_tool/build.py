@@ -127,16 +127,17 @@ class ScratchTool(object):
         thickness_remaining_under_slot = s.worst_case_glass_thickness + s.pedestal_z - s.glass_pocket_depth
 
         cq.Workplane.undercutRelief2D = tb.u.undercutRelief2D
-        t = cq.CQ().box(x, y, top_z, centered=(True, True, False)).val().Solids()[0]
-        t = cq.CQ().add(t).edges("|Z").fillet(2).val().Solids()[0]  # fillet side edges
-        t = cq.CQ().add(t).faces(">Z[-1]").edges().chamfer(0.5).val().Solids()[0]  # chamfer top edges
-        t = cq.CQ().add(t).faces("<Z[-1]").workplane(centerOption=co).undercutRelief2D(pedistal_pocket_xy, pedistal_pocket_xy, s.ctr).cutBlind(-s.pedestal_z).val().Solids()[0]  # cut indent for pedistal
-        t = cq.CQ().add(t).faces("<Z[-2]").workplane(centerOption=co).undercutRelief2D(glass_pocket_xy, glass_pocket_xy, s.ctr).cutBlind(-(s.worst_case_glass_thickness + s.final_glass_thickness_margin)).val().Solids()[0]  # cut pocket glass lives in
-        t = cq.CQ().add(t).faces("<Z[-3]").workplane(centerOption=co).undercutRelief2D(s.safe_step_xy, s.safe_step_xy, s.ctr).cutBlind(-s.safe_step_z).val().Solids()[0]  # cut tiny step to protect device surface
-        #t = cq.CQ().add(t).faces("<Z[-1]").workplane(centerOption=co).pushPoints([[-s.dowel_xy_spacing/2,-s.dowel_xy_spacing/2],[s.dowel_xy_spacing/2,s.dowel_xy_spacing/2]]).cskHole(s.dowel_ultra_clearance_d, 19, 90).val().Solids()[0]  # ultra clearance holes
-        t = cq.CQ().add(t).faces("<Z[-1]").workplane(centerOption=co).pushPoints([[-s.dowel_xy_spacing/2,-s.dowel_xy_spacing/2]]).cskHole(dowel_clearance_hole_d, 15, 90).val().Solids()[0]  # clearance hole marked in drawing as "3C9"
-        t = cq.CQ().add(t).faces("<Z[-1]").workplane(centerOption=co).pushPoints([[ s.dowel_xy_spacing/2, s.dowel_xy_spacing/2]]).cskHole(dowel_clearance_hole_d, 15, 90).val().Solids()[0]  # clearance slot-hole
-        t = cq.CQ().add(t).faces("<Z[-1]").workplane(centerOption=co).pushPoints([[ s.dowel_xy_spacing/2, s.dowel_xy_spacing/2]]).slot2D(4,3,45).cutThruAll().val().Solids()[0]  # clearance slot marked in drawing as "3C9"
+        # every top is the same up to its slots, so that part is memoized (built once, then reused from the cache)
+        t = tb.memo.memo(cq.CQ()).box(x, y, top_z, centered=(True, True, False))
+        t = t.edges("|Z").fillet(2)  # fillet side edges
+        t = t.faces(">Z[-1]").edges().chamfer(0.5)  # chamfer top edges
+        t = t.faces("<Z[-1]").workplane(centerOption=co).undercutRelief2D(pedistal_pocket_xy, pedistal_pocket_xy, s.ctr).cutBlind(-s.pedestal_z)  # cut indent for pedistal
+        t = t.faces("<Z[-2]").workplane(centerOption=co).undercutRelief2D(glass_pocket_xy, glass_pocket_xy, s.ctr).cutBlind(-(s.worst_case_glass_thickness + s.final_glass_thickness_margin))  # cut pocket glass lives in
+        t = t.faces("<Z[-3]").workplane(centerOption=co).undercutRelief2D(s.safe_step_xy, s.safe_step_xy, s.ctr).cutBlind(-s.safe_step_z)  # cut tiny step to protect device surface
+        #t = t.faces("<Z[-1]").workplane(centerOption=co).pushPoints([[-s.dowel_xy_spacing/2,-s.dowel_xy_spacing/2],[s.dowel_xy_spacing/2,s.dowel_xy_spacing/2]]).cskHole(s.dowel_ultra_clearance_d, 19, 90)  # ultra clearance holes
+        t = t.faces("<Z[-1]").workplane(centerOption=co).pushPoints([[-s.dowel_xy_spacing/2,-s.dowel_xy_spacing/2]]).cskHole(dowel_clearance_hole_d, 15, 90)  # clearance hole marked in drawing as "3C9"
+        t = t.faces("<Z[-1]").workplane(centerOption=co).pushPoints([[ s.dowel_xy_spacing/2, s.dowel_xy_spacing/2]]).cskHole(dowel_clearance_hole_d, 15, 90)  # clearance slot-hole
+        t = t.faces("<Z[-1]").workplane(centerOption=co).pushPoints([[ s.dowel_xy_spacing/2, s.dowel_xy_spacing/2]]).slot2D(4,3,45).cutThruAll().val().Solids()[0]  # clearance slot marked in drawing as "3C9"
 
         if center_slot_width > 0:
             t = cq.CQ().add(t).faces(">Z[-1]").workplane(centerOption=po).transformed(rotate=(0, 0, rot)).rect(center_slot_width, y).cutBlind(-(top_z - thickness_remaining_under_slot)).val().Solids()[0]  # cut the central slot
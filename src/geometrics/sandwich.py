@@ -109,10 +109,14 @@ class Sandwich(object):
         s.wingnut_hole_d = s.es_dia + 0.3
 
     def build(self):
+        with tb.u.cache_selections():  # the same few selectors get used over and over on each layer
+            return self._build()
+
+    def _build(self):
         s = self
         assembly = []
         # make the spacer base layer
-        sandwitch_base = cq.Workplane("XY")
+        sandwitch_base = tb.u.deferred(cq.Workplane("XY"))  # holes in a layer get cut in one go (before its fillets)
         sandwitch_base = sandwitch_base.box(s.leng, s.wid, s.base_t, centered=(True, True, False))
         sandwitch_base = sandwitch_base.faces(">Z").workplane(centerOption="CenterOfBoundBox").rarray(s.cutout_spacing, 1, s.n_cutouts, 1).rect(s.base_cutouts_xy, s.base_cutouts_xy).cutThruAll()
         sandwitch_base = sandwitch_base.faces(">Z").workplane(centerOption="CenterOfBoundBox").rarray(s.end_aligner_x_spacing, s.end_aligner_y_spacing, 2, 2).hole(s.alignment_diameter_press)
@@ -154,6 +158,7 @@ class Sandwich(object):
 
         # make the pusher downer base layer
         pusher = holder_layer.faces(">Z").workplane(centerOption="CenterOfBoundBox").box(s.leng, s.wid, s.pusher_t, centered=(True, True, False), combine=False)
+        pusher = cq.Workplane("XY").add(pusher.vals())  # where the pusher's notches go depends on the previous notches, so no deferring here
 
         # make the actual pusher downers
         for x in s.espace(s.n_cutouts,s.cutout_spacing):  # iterate through the positions
@@ -1,5 +1,33 @@
-from . import constants as c  # noqa: F401
-from . import endblock  # noqa: F401
-from . import utilities as u  # noqa: F401
-from . import passthrough  # noqa: F401
-from . import groovy
+import importlib
+
+# submodules get imported on first use (PEP 562), so e.g. tb.c doesn't pull in cadquery or cq_warehouse
+_submodules = {
+    "c": "constants",
+    "u": "utilities",
+    "constants": "constants",
+    "utilities": "utilities",
+    "endblock": "endblock",
+    "fasteners": "fasteners",
+    "memo": "memo",
+    "orings": "orings",
+    "passthrough": "passthrough",
+    "groovy": "groovy",
+    "components": "components",
+    "cq_serialize": "cq_serialize",
+    "lid": "lid",
+    "twod_to_threed": "twod_to_threed",
+}
+
+__all__ = list(_submodules)
+
+
+def __getattr__(name):
+    if name in _submodules:
+        module = importlib.import_module(f".{_submodules[name]}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,355 @@
+import json
+import math
+import hashlib
+import logging
+import pathlib
+from copy import copy
+import cadquery as cq
+from OCP.Bnd import Bnd_Box, Bnd_OBB
+from OCP.BRepBndLib import BRepBndLib
+from OCP.BRep import BRep_Builder
+from OCP.TopoDS import TopoDS_Solid, TopoDS_Iterator
+from OCP.TopAbs import TopAbs_INTERNAL, TopAbs_VERTEX
+from OCP.gp import gp_Trsf
+from . import utilities as u
+
+"""
+an index of the STEP files in a component folder, so that their size and placement
+can be looked up without loading their geometry
+and simplified proxy geometry to stand in for components while building interactively
+"""
+
+# setup logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+ch = logging.StreamHandler()
+ch.setLevel(logging.DEBUG)
+formatter = logging.Formatter(("%(asctime)s|%(name)s|%(levelname)s|" "%(message)s"))
+ch.setFormatter(formatter)
+logger.addHandler(ch)
+
+step_suffixes = (".step", ".stp")
+
+# indices we've already loaded in this process, keyed by resolved folder
+indices: dict[str, "ComponentIndex"] = {}
+
+# the kinds of proxy geometry we know how to make
+proxy_kinds = ("obb", "hull", "revolve")
+
+# every proxy solid carries these as internal vertices so that we can later tell
+# where it was moved to and put the real component there instead
+marker_points = ((0, 0, 0), (1, 0, 0), (0, 2, 0), (0, 0, 3))
+
+# after those, a proxy's id (see _proxy_id) is carried by one more internal vertex per hex digit
+# the digit at position i sits at (-(digit + 1), -(i + 1), 0) in the marker frame
+n_id_digits = 8
+
+# the proxies made in this process, as (component file, proxy volume), keyed by proxy id
+proxies: dict[int, tuple[pathlib.Path, float]] = {}
+
+# proxy solids we've already made or loaded in this process
+# keyed by (STEP file cache key, proxy kind)
+proxy_cache: dict[tuple, cq.Solid] = {}
+
+# the proxy id for each face (TShape) of every proxy in proxy_cache
+# booleans drop the markers but keep the faces they didn't touch, so this is how we spot cut or fused proxies
+proxy_faces: dict = {}
+
+
+class LazyComponent(cq.Workplane):
+    """
+    A workplane for a component STEP file that only loads the real geometry
+    the first time something looks at its objects (cutting with it, exporting it, showing it...)
+    Until then, its bounding box, volume, solid count and origin offset come from the index
+    """
+
+    def __init__(self, file: pathlib.Path | None = None, info: dict | None = None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.file = file
+        self.info = info
+        if file is not None:
+            self._objects = None  # not loaded yet
+
+    @property
+    def objects(self):
+        if self._objects is None:
+            self._objects = u.import_step(self.file).vals()
+        return self._objects
+
+    @objects.setter
+    def objects(self, value):
+        self._objects = value
+
+    @property
+    def loaded(self) -> bool:
+        return self._objects is not None
+
+    def newObject(self, objlist):
+        """the results of operations on a component are ordinary workplanes"""
+        ns = cq.Workplane()
+        ns.plane = copy(self.plane)
+        ns.parent = self
+        ns.objects = list(objlist)
+        ns.ctx = self.ctx
+        return ns
+
+    @property
+    def bounding_box(self) -> cq.BoundBox:
+        bb = Bnd_Box()
+        bb.Update(*self.info["bbox"])
+        return cq.BoundBox(bb)
+
+    @property
+    def volume(self) -> float:
+        return self.info["volume"]
+
+    @property
+    def n_solids(self) -> int:
+        return self.info["n_solids"]
+
+    @property
+    def origin_offset(self) -> cq.Vector:
+        """where the component's bounding box center sits relative to the origin of its STEP file"""
+        return cq.Vector(self.info["origin_offset"])
+
+    def placeholder(self) -> cq.Solid:
+        """a box filling the component's bounding box, for quick previews"""
+        bb = self.bounding_box
+        return cq.Solid.makeBox(bb.xlen, bb.ylen, bb.zlen, pnt=cq.Vector(bb.xmin, bb.ymin, bb.zmin))
+
+
+class ComponentIndex(object):
+    """
+    Index of the STEP files in a folder
+    The index is stored in the on-disk cache and entries are refreshed whenever their file changes
+    """
+
+    def __init__(self, folder: pathlib.Path, index_file: pathlib.Path | None = None):
+        self.folder = pathlib.Path(folder).resolve()
+        if index_file is None:
+            digest = hashlib.sha1(str(self.folder).encode()).hexdigest()
+            index_file = u.get_cache_dir("index") / f"{digest}.json"
+        self.index_file = index_file
+        self.entries: dict[str, dict] = {}
+        if self.index_file.is_file():
+            with open(self.index_file) as fh:
+                self.entries = json.load(fh)
+        self.refresh()
+
+    @staticmethod
+    def _measure(file: pathlib.Path) -> dict:
+        """load a component and work out its index entry"""
+        st = file.stat()
+        cpnd = cq.Compound.makeCompound(u.import_step(file, proxy=False).vals())
+        bb = cpnd.BoundingBox()
+        return {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "bbox": [bb.xmin, bb.ymin, bb.zmin, bb.xmax, bb.ymax, bb.zmax],
+            "volume": cpnd.Volume(),
+            "n_solids": len(cpnd.Solids()),
+            "origin_offset": list(bb.center.toTuple()),
+        }
+
+    def refresh(self):
+        """(re)index any STEP files that are new or have changed, forget ones that are gone"""
+        changed = False
+        files = {f.name: f for f in sorted(self.folder.iterdir()) if f.is_file() and f.suffix.lower() in step_suffixes}
+        for name in list(self.entries):
+            if name not in files:
+                del self.entries[name]
+                changed = True
+        for name, file in files.items():
+            st = file.stat()
+            entry = self.entries.get(name)
+            if (entry is None) or (entry["mtime_ns"] != st.st_mtime_ns) or (entry["size"] != st.st_size):
+                self.entries[name] = self._measure(file)
+                logger.info(f"Indexed {file}")
+                changed = True
+        if changed:
+            with open(self.index_file, "w") as fh:
+                json.dump(self.entries, fh, indent=1)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __getitem__(self, name: str) -> LazyComponent:
+        return LazyComponent(self.folder / name, self.entries[name])
+
+
+def get_component(file: pathlib.Path) -> LazyComponent:
+    """get a lazy handle on a component STEP file via the index of the folder it's in"""
+    folder = str(pathlib.Path(file).parent.resolve())
+    if folder not in indices:
+        indices[folder] = ComponentIndex(pathlib.Path(folder))
+    return indices[folder][pathlib.Path(file).name]
+
+
+def _obb_proxy(shape: cq.Shape) -> cq.Solid:
+    """an oriented bounding box around shape"""
+    obb = Bnd_OBB()
+    BRepBndLib.AddOBB_s(shape.wrapped, obb, True, True, False)
+    hx, hy, hz = obb.XHSize(), obb.YHSize(), obb.ZHSize()
+    box = cq.Solid.makeBox(2 * hx, 2 * hy, 2 * hz, pnt=cq.Vector(-hx, -hy, -hz))
+    plane = cq.Plane(origin=cq.Vector(obb.Center()), xDir=cq.Vector(obb.XDirection()), normal=cq.Vector(obb.ZDirection()))
+    return box.transformShape(plane.rG)
+
+
+def _hull_proxy(shape: cq.Shape, tolerance: float = 0.1) -> cq.Solid:
+    """the convex hull of shape (needs scipy)"""
+    from scipy.spatial import ConvexHull
+
+    points, _ = shape.tessellate(tolerance)
+    hull = ConvexHull([p.toTuple() for p in points])
+    faces = [cq.Face.makeFromWires(cq.Wire.makePolygon([points[i] for i in simplex], close=True)) for simplex in hull.simplices]
+    return cq.Solid.makeSolid(cq.Shell.makeShell(faces)).clean()
+
+
+def _revolve_proxy(shape: cq.Shape, n_slices: int = 32, tolerance: float = 0.1) -> cq.Solid:
+    """a stepped silhouette of shape revolved around the Z axis, good for axisymmetric parts"""
+    points, _ = shape.tessellate(tolerance)
+    zs = [p.z for p in points]
+    zmin, zmax = min(zs), max(zs)
+    dz = (zmax - zmin) / n_slices
+    radii = [0.0] * n_slices
+    for p in points:
+        i = min(int((p.z - zmin) / dz), n_slices - 1)
+        radii[i] = max(radii[i], math.hypot(p.x, p.y))
+    # slices with no tessellation points in them (long straight faces) get the larger of their neighbours
+    filled = [i for i, r in enumerate(radii) if r > 0]
+    for i, r in enumerate(radii):
+        if r == 0:
+            below = max((j for j in filled if j < i), default=None)
+            above = min((j for j in filled if j > i), default=None)
+            radii[i] = max(radii[j] for j in (below, above) if j is not None)
+    profile = [(0, zmin)]
+    for i, r in enumerate(radii):
+        if r != profile[-1][0]:  # only step where the radius changes
+            profile.append((r, zmin + i * dz))
+            profile.append((r, zmin + (i + 1) * dz))
+        else:
+            profile[-1] = (r, zmin + (i + 1) * dz)
+    profile.append((0, zmax))
+    return cq.Workplane("XZ").polyline(profile).close().revolve(360, (0, 0, 0), (0, 1, 0)).solids().val().clean()
+
+
+proxy_builders = {"obb": _obb_proxy, "hull": _hull_proxy, "revolve": _revolve_proxy}
+
+
+def _proxy_id(file: pathlib.Path) -> int:
+    """a number identifying a component file that fits in the id markers"""
+    return int(hashlib.sha1(str(pathlib.Path(file).resolve()).encode()).hexdigest()[:n_id_digits], 16)
+
+
+def _add_markers(solid: cq.Solid, proxy_id: int) -> cq.Solid:
+    """a copy of solid with the marker points and proxy_id added to it as internal vertices"""
+    digits = [(proxy_id >> (4 * i)) & 0xF for i in range(n_id_digits)]
+    points = list(marker_points) + [(-(digit + 1), -(i + 1), 0) for i, digit in enumerate(digits)]
+    builder = BRep_Builder()
+    marked = TopoDS_Solid()
+    builder.MakeSolid(marked)
+    it = TopoDS_Iterator(solid.wrapped)
+    while it.More():
+        builder.Add(marked, it.Value())
+        it.Next()
+    for point in points:
+        builder.Add(marked, cq.Vertex.makeVertex(*point).wrapped.Oriented(TopAbs_INTERNAL))
+    return cq.Solid(marked)
+
+
+def _get_markers(solid: cq.Solid) -> list[cq.Vector]:
+    """where the marker points of a proxy solid are now"""
+    markers = []
+    it = TopoDS_Iterator(solid.wrapped)
+    while it.More():
+        if it.Value().ShapeType() == TopAbs_VERTEX:
+            markers.append(cq.Vertex(it.Value()).Center())
+        it.Next()
+    return markers
+
+
+def _read_markers(markers: list[cq.Vector]) -> tuple[gp_Trsf, int | None]:
+    """the placement of a proxy and its id (None if that can't be read) from its markers"""
+    o, x, y, z = markers[: len(marker_points)]
+    ex, ey, ez = (x - o), (y - o) / 2, (z - o) / 3
+    placement = gp_Trsf()
+    placement.SetValues(ex.x, ey.x, ez.x, o.x, ex.y, ey.y, ez.y, o.y, ex.z, ey.z, ez.z, o.z)
+
+    digits = {}
+    for marker in markers[len(marker_points) :]:
+        local = marker - o
+        digits[round(-local.dot(ey) / ey.dot(ey)) - 1] = round(-local.dot(ex) / ex.dot(ex)) - 1
+    if sorted(digits) != list(range(n_id_digits)) or not all(0 <= d <= 0xF for d in digits.values()):
+        return placement, None
+    return placement, sum(digit << (4 * i) for i, digit in digits.items())
+
+
+def make_proxy(file: pathlib.Path, kind: str = "obb") -> cq.Solid:
+    """
+    make (or fetch from the caches) a simplified stand-in for a component STEP file
+    the result carries marker vertices so it can be swapped for the real thing, see swap_proxies()
+    every call gets its own handle on the same proxy geometry
+    """
+    if kind not in proxy_kinds:
+        raise ValueError(f"Proxy kind must be one of {proxy_kinds}")
+    key = u._step_key(file)
+    if (key, kind) not in proxy_cache:
+        proxy_id = _proxy_id(file)
+        digest = hashlib.sha1("|".join(str(k) for k in key).encode()).hexdigest()
+        bin_file = u.get_cache_dir("proxy") / f"{digest}-{kind}-{proxy_id:08x}.bin"
+        if bin_file.is_file():
+            proxy = cq.Shape.importBin(str(bin_file))
+        else:
+            proxy = _add_markers(proxy_builders[kind](cq.Compound.makeCompound(u.import_step(file, proxy=False).vals())), proxy_id)
+            proxy.exportBin(str(bin_file))
+            logger.info(f"Made {kind} proxy for {file}")
+        proxy_cache[(key, kind)] = proxy
+        proxies[proxy_id] = (pathlib.Path(file), proxy.Volume())
+        for face in proxy.Faces():
+            proxy_faces[face.wrapped.TShape()] = proxy_id
+    proxy = proxy_cache[(key, kind)]
+    return cq.Solid(proxy.wrapped.Located(proxy.wrapped.Location()))
+
+
+def unproxy(shape):
+    """
+    if shape is (or contains) a proxy, returns it with the real component moved to where the proxy is
+    proxies that can't be swapped back (they were cut, fused or otherwise changed) are left as they are, with a warning
+    """
+    if isinstance(shape, cq.Compound):
+        children = list(shape)
+        swapped = [unproxy(child) for child in children]
+        if any(a is not b for a, b in zip(children, swapped)):
+            return cq.Compound.makeCompound(swapped)
+        return shape
+    if not isinstance(shape, cq.Solid):
+        return shape
+
+    markers = _get_markers(shape)
+    if len(markers) < len(marker_points):
+        proxy_ids = {proxy_faces[face.wrapped.TShape()] for face in shape.Faces() if face.wrapped.TShape() in proxy_faces}
+        for proxy_id in proxy_ids:
+            logger.warning(f"A proxy for {proxies[proxy_id][0]} was cut or fused into another shape, that shape still has the proxy's geometry")
+        return shape
+
+    placement, proxy_id = _read_markers(markers)
+    if proxy_id not in proxies:
+        logger.warning("Found a proxy whose component file isn't known in this process, leaving it as a proxy")
+        return shape
+    file, volume = proxies[proxy_id]
+    if not math.isclose(shape.Volume(), volume, rel_tol=1e-6):
+        logger.warning(f"The proxy for {file} was changed during the build, leaving it as a proxy")
+        return shape
+    return cq.Compound.makeCompound(u.import_step(file, proxy=False).vals())._apply_transform(placement)
+
+
+def swap_proxies(assembly: cq.Assembly):
+    """replace any proxies in an assembly with the real components they stand in for"""
+    for _, val in assembly.traverse():
+        if isinstance(val.obj, cq.Shape):
+            val.obj = unproxy(val.obj)
+        elif isinstance(val.obj, cq.Workplane):
+            val.obj = val.obj.newObject([unproxy(o) for o in val.obj.objects])
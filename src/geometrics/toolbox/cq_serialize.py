@@ -51,6 +51,29 @@ def _reduce_transform(transform: OCP.gp.gp_Trsf):
     return _inflate_transform, tuple(transform.Value(i, j) for i in range(1, 4) for j in range(1, 5))
 
 
+def _inflate_workplane(shapes: list):
+    return cq.Workplane().add(shapes)
+
+
+def _reduce_workplane(wp: cq.Workplane):
+    # only the shapes on the stack make the trip
+    return _inflate_workplane, ([cq.Shape.cast(val.wrapped) for val in wp.vals() if isinstance(val, cq.Shape)],)
+
+
+def _inflate_assembly(obj, loc, name, color, metadata, children):
+    assy = cq.Assembly(obj, loc=loc, name=name, color=color, metadata=metadata)
+    for child in children:
+        assy.add(child)
+    return assy
+
+
+def _reduce_assembly(assy: cq.Assembly):
+    obj = assy.obj
+    if isinstance(obj, cq.Shape):
+        obj = cq.Shape.cast(obj.wrapped)  # subclasses (e.g. fasteners) travel as their plain shape
+    return _inflate_assembly, (obj, assy.loc, assy.name, assy.color, assy.metadata, assy.children)
+
+
 def register():
     """
     Registers pickle support functions for common CadQuery and OCCT objects.
@@ -71,3 +94,6 @@ def register():
     copyreg.pickle(OCP.gp.gp_Trsf, _reduce_transform)
     # copyreg.pickle(OCP.gp.gp_Ax3, _reduce_transform)
     copyreg.pickle(cq.Location, lambda loc: (cq.Location, (loc.wrapped.Transformation(),)))
+    copyreg.pickle(cq.Color, lambda color: (cq.Color, color.toTuple()))
+    copyreg.pickle(cq.Workplane, _reduce_workplane)
+    copyreg.pickle(cq.Assembly, _reduce_assembly)
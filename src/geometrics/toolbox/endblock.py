@@ -1,16 +1,15 @@
+import os
+import hashlib
+import pathlib
+import dataclasses
 import cadquery as cq
 from . import constants as c
+from . import utilities as u
 
 """
 block for mounting PCBs
 """
 
-width: float = None  # type: ignore[assignment]
-length: float = None  # type: ignore[assignment]
-height: float = None  # type: ignore[assignment]
-csk_diameter: float = None  # type: ignore[assignment]
-base_mount_screw_size: float = None  # type: ignore[assignment]
-
 # these two numbers are taken from the PCB design
 pcb_mount_hole_bottom_height = 3.5
 pcb_mount_hole_spacing = 13
@@ -33,6 +32,28 @@ pressfit_hole_depth = 10
 blind_hole_depth = 7.5
 pcb_mount_hole_x_center_from_edge = 3
 
+
+@dataclasses.dataclass(frozen=True)
+class Endblock:
+    """a built endblock and its dimensions"""
+
+    solid: cq.Solid
+    width: float
+    length: float
+    height: float
+    csk_diameter: float | None  # None when the base mount hole is threaded from the bottom
+    base_mount_screw_size: str
+
+    @property
+    def block(self) -> cq.Workplane:
+        """a fresh workplane holding the endblock"""
+        return cq.Workplane("XY").add(self.solid)
+
+
+# endblocks we've already built in this process, keyed by build()'s arguments
+build_cache: dict[tuple, Endblock] = {}
+
+
 def build(
     adapter_width=30,
     block_length=12,
@@ -43,8 +64,9 @@ def build(
     align_bumps=False,
     pfdowel=False,
     thread_length_from_bottom=0,  # if non-zero, instead of a countersink from above, we'll get this many mm of threads up from the bottom
-    base_mount_screw="m5", 
-):
+    base_mount_screw="m5",
+    use_cache=True,
+) -> Endblock:
     """
     Builds up an endblock.
     vertm3s True means there will be two m3 csk holes vertically up from the bottom
@@ -52,21 +74,53 @@ def build(
     horzm3s means there will two m3 mounts on the back
     align_bumps means there will be two updents in the top
     pfdowel means there will be holes for pressfit dowels in the top
+    returns an Endblock, whose .block is the endblock on a workplane
 
+    identical builds are only done once per process, and their solids are kept in the on-disk cache
+    (which gets invalidated whenever this file changes)
     """
-    global width, length, height, csk_diameter, base_mount_screw_size
-    cska = c.std_countersinks[base_mount_screw]["angle"]
-
     if (vertm3s is True) and (horzm3s is True):
         raise (ValueError("Hole collision while building endblock"))
 
     if sum((pfdowel, align_bumps, vertm3s)) > 1:
         raise (ValueError("Only one can be true: vertm3s, align_bumps, pfdowel"))
 
+    key = (adapter_width, block_length, block_height, special_chamfer, vertm3s, horzm3s, align_bumps, pfdowel, thread_length_from_bottom, base_mount_screw)
+    if use_cache and (key in build_cache):
+        return build_cache[key]
+
     width = adapter_width - c.pcb_thickness
     length = block_length
     height = block_height
-    base_mount_screw_size = base_mount_screw
+    csk_diameter = length - 1.5 if thread_length_from_bottom == 0 else None
+
+    bin_file = None
+    if use_cache:
+        # the block's shape also comes from the constants and utilities (deferred(), multiMirror()) it uses
+        sources = b"".join(pathlib.Path(file).read_bytes() for file in (__file__, c.__file__, u.__file__))
+        constants = (c.pcb_thickness, c.std_countersinks, c.std_screw_threads)
+        digest = hashlib.sha1(sources + repr((cq.__version__, constants, key)).encode()).hexdigest()
+        bin_file = u.get_cache_dir("endblock") / f"{digest}.bin"
+
+    if (bin_file is not None) and bin_file.is_file():
+        solid = cq.Shape.importBin(str(bin_file))
+    else:
+        solid = _build_block(width, length, height, special_chamfer, vertm3s, horzm3s, align_bumps, pfdowel, thread_length_from_bottom, base_mount_screw, csk_diameter).findSolid()
+        if bin_file is not None:
+            tmp_file = bin_file.with_suffix(f".{os.getpid()}.tmp")
+            solid.exportBin(str(tmp_file))
+            tmp_file.replace(bin_file)
+
+    result = Endblock(solid=solid, width=width, length=length, height=height, csk_diameter=csk_diameter, base_mount_screw_size=base_mount_screw)
+    if use_cache:
+        build_cache[key] = result
+    return result
+
+
+def _build_block(width, length, height, special_chamfer, vertm3s, horzm3s, align_bumps, pfdowel, thread_length_from_bottom, base_mount_screw_size, csk_diameter) -> cq.Workplane:
+    """does the geometry work for build()"""
+    block_height = height
+    cska = c.std_countersinks[base_mount_screw_size]["angle"]
 
     pcb_mount_holea_z = -block_height / 2 + pcb_mount_hole_bottom_height
     pcb_mount_holeb_z = pcb_mount_holea_z + pcb_mount_hole_spacing
@@ -76,7 +130,7 @@ def build(
     back_aux_hole_z = block_height / 2 - back_aux_hole_from_top
 
     # build the block
-    block = cq.Workplane("XY").box(length, width, height)
+    block = u.deferred(cq.Workplane("XY").box(length, width, height))  # holes get batched up between the chamfers
 
     # put in the PCB mounting holes
     cskbd = c.std_screw_threads["m2"]["tap_r"] * 2
@@ -135,8 +189,6 @@ def build(
     block = block.edges("|Z and %Line").chamfer(chamfer_l)
 
     if thread_length_from_bottom == 0:
-        csk_diameter = length - 1.5
-
         # base mount hole for use with RS Stock No. 908-7532 machine screws
         csktd = 2 * c.std_screw_threads[base_mount_screw_size]["close_r"]
         block = (
@@ -213,9 +265,9 @@ def build(
         
     
 
-    return block
+    return block.finalize()
 
 
 # only for running standalone in cq-editor
 if "show_object" in locals():
-    show_object(build(horzm3s=True, align_bumps=True, special_chamfer=1.6))
+    show_object(build(horzm3s=True, align_bumps=True, special_chamfer=1.6).block)
@@ -0,0 +1,67 @@
+import os
+import copy
+import hashlib
+import logging
+import importlib.metadata
+import cadquery as cq
+from . import utilities as u
+
+"""
+cached construction of cq_warehouse fasteners
+making a threaded (simple=False) fastener takes seconds, so each one is only made once per process
+and its solid is kept in the on-disk cache for later runs
+"""
+
+# setup logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+ch = logging.StreamHandler()
+ch.setLevel(logging.DEBUG)
+formatter = logging.Formatter(("%(asctime)s|%(name)s|%(levelname)s|" "%(message)s"))
+ch.setFormatter(formatter)
+logger.addHandler(ch)
+
+# fasteners we've already made in this process
+# keyed by (class name, size, fastener_type, length, simple)
+fastener_cache: dict[tuple, cq.Solid] = {}
+
+
+def _warehouse_version() -> str:
+    import cq_warehouse
+
+    try:
+        return cq_warehouse.__version__
+    except AttributeError:
+        return importlib.metadata.version("cq_warehouse")
+
+
+def get_fastener(cls, size: str, fastener_type: str, length: float | None = None, simple: bool = True):
+    """
+    get a cq_warehouse fastener, e.g. get_fastener(CounterSunkScrew, "M3-0.5", "iso14581", length=10)
+    every call gets its own handle on the same underlying geometry, so placing it
+    (via .locate(), .moved(), clearanceHole(..., baseAssembly=...) etc.) never regenerates the threads
+    nuts take no length, so leave it as None for those
+    """
+    key = (cls.__name__, size, fastener_type, length, simple)
+    if key not in fastener_cache:
+        kwargs = {"size": size, "fastener_type": fastener_type}
+        if length is not None:
+            kwargs["length"] = length
+        # a new cq_warehouse (or cadquery) can make the same fastener differently
+        digest = hashlib.sha1(repr((_warehouse_version(), cq.__version__) + key).encode()).hexdigest()
+        bin_file = u.get_cache_dir("fastener") / f"{digest}.bin"
+        if bin_file.is_file():
+            # the simple version is quick to make and has all the same dimensions for the holes
+            fastener = cls(**kwargs, simple=True)
+            fastener.wrapped = cq.Shape.importBin(str(bin_file)).wrapped
+        else:
+            fastener = cls(**kwargs, simple=simple)
+            tmp_file = bin_file.with_suffix(f".{os.getpid()}.tmp")
+            fastener.exportBin(str(tmp_file))
+            tmp_file.replace(bin_file)
+            logger.info(f"Made {cls.__name__} {size} {fastener_type} {length=} {simple=}")
+        fastener_cache[key] = fastener
+
+    fastener = copy.copy(fastener_cache[key])
+    fastener.wrapped = fastener.wrapped.Located(fastener.wrapped.Location())  # our own handle, shared geometry
+    return fastener
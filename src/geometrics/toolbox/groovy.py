@@ -3,7 +3,14 @@ import cadquery
 from cadquery import cq, CQ
 import math
 import pathlib
+import collections
+import functools
+import concurrent.futures
+from OCP.TopAbs import TopAbs_REVERSED
+from OCP.TopLoc import TopLoc_Location
+from OCP.BRepTools import BRepTools_WireExplorer
 from . import utilities as u
+from .cq_serialize import register as register_cq_helper
 import logging
 
 # setup logging
@@ -15,6 +22,22 @@ formatter = logging.Formatter(("%(asctime)s|%(name)s|%(levelname)s|" "%(message)
 ch.setFormatter(formatter)
 logger.addHandler(ch)
 
+# how mk_groove builds grooves: "offset" makes them from 2D offsets of the path when it's planar
+# (and falls back to sweeping when it's not, or for vgrooves when the path has sharp corners),
+# "sweep" always sweeps the cross-section along the path, both give the same groove
+groove_construction = "offset"
+
+# how much detail goes into o-ring hardware: "full" sweeps the squished ring's cross-section along its path,
+# "analytic" builds it from straight extrusions and revolved (torus) corners, for paths of lines and arcs,
+# "centerline" gives only the path wire
+hardware_fidelity = "full"
+
+# o-ring hardware we've already made (most recently used last, at most oring_cache_size of them)
+# keyed by fidelity, ring parameters and path signature
+# values are (hardware, the groove plane it was made on)
+oring_cache: collections.OrderedDict[tuple, tuple[cq.Shape, cq.Plane]] = collections.OrderedDict()
+oring_cache_size = 256
+
 
 def get_gland_height(ring_cs=1, compression_ratio: float = 0.25):
     return ring_cs * (1 - compression_ratio)
@@ -29,6 +52,176 @@ def get_gland_width(ring_cs=1, compression_ratio: float = 0.25, gland_fill_ratio
     return width
 
 
+@functools.lru_cache
+def get_groove_cross_section(vdepth: float = 0, ring_cs: float = 0, compression_ratio: float = 0.25, gland_fill_ratio: float = 0.7) -> cq.Face:
+    """
+    the cross-section face of a groove cutter in a canonical frame:
+    the groove's path runs along +Z through the origin and the surface being cut into has normal +X
+    use .moved(cq.Location(plane)) to place it on a path
+    """
+    if vdepth > 0:  # we'll cut a vgroove this deep
+        points = [(0, -vdepth), (-vdepth, 0), (0, vdepth)]
+    elif ring_cs > 0:  # we'll cut an o-ring groove, ring_cs is the diameter of the cross section of the o-ring
+        # according to https://web.archive.org/web/20220512010502/https://www.globaloring.com/o-ring-groove-design/
+        gland_height = get_gland_height(ring_cs, compression_ratio)
+        gland_width = get_gland_width(ring_cs, compression_ratio, gland_fill_ratio)
+        points = [(0, -gland_width / 2), (-gland_height, -gland_width / 2), (-gland_height, gland_width / 2), (0, gland_width / 2)]
+    else:
+        raise ValueError("One of vdepth or ring_cs must be larger than 0")
+    return cq.Face.makeFromWires(cq.Wire.makePolygon([cq.Vector(x, y, 0) for x, y in points], close=True))
+
+
+def _is_planar(wire: cq.Wire, normal: cq.Vector, tol: float = 1e-4) -> bool:
+    """true if wire is closed and lies in a plane with the given normal"""
+    if not wire.IsClosed():
+        return False
+    p0 = wire.positionAt(0)
+    points = [v.Center() for v in wire.Vertices()] + [wire.positionAt(i / 32) for i in range(32)]
+    return all(abs((p - p0).dot(normal)) < tol for p in points)
+
+
+def _is_smooth(wire: cq.Wire, tol: float = 1e-6) -> bool:
+    """true if wire's direction doesn't jump anywhere along it (no sharp corners)"""
+    tangents = []  # (start, end) directions of each edge, in order along the wire
+    explorer = BRepTools_WireExplorer(wire.wrapped)
+    while explorer.More():
+        edge = cq.Edge(explorer.Current())
+        start, end = edge.tangentAt(0), edge.tangentAt(1)
+        if explorer.Current().Orientation() == TopAbs_REVERSED:
+            start, end = -end, -start
+        tangents.append((start, end))
+        explorer.Next()
+    return all(tangents[i - 1][1].dot(start) > 1 - tol for i, (start, _) in enumerate(tangents))
+
+
+def _offset2D(wire: cq.Wire, d: float) -> list[cq.Wire]:
+    """
+    Wire.offset2D, but right for located wires (like ones from sketches), OCCT would apply the location twice
+    corners are joined like a sweep along the wire would make them (sharp, not rounded)
+    """
+    loc = cq.Location(wire.wrapped.Location())
+    return [w.moved(loc) for w in cq.Wire(wire.wrapped.Located(TopLoc_Location())).offset2D(d, kind="intersection")]
+
+
+def _tapered(face: cq.Face, vec: cq.Vector, taper: float) -> cq.Solid:
+    """extrudeLinear with a taper, but also going the right way for faces that are reversed relative to their surface"""
+    if face.wrapped.Orientation() == TopAbs_REVERSED:
+        face = cq.Face(face.wrapped.Reversed())
+    return cq.Solid.extrudeLinear(face, vec, taper=taper)
+
+
+def _offset_groove(wire: cq.Wire, normal: cq.Vector, vdepth: float, ring_cs: float, compression_ratio: float, gland_fill_ratio: float) -> cq.Solid | None:
+    """
+    the groove along a closed planar path, built without a sweep:
+    a gland is the region between the path's inward and outward offsets extruded to the gland depth
+    a vgroove is the outward offset tapered in minus the inward offset tapered out
+    gives None if the offsets don't work out (e.g. the path bends too tightly for the groove)
+    or for vgrooves along paths with sharp corners, where tapering doesn't come out like the sweep
+    """
+    if (vdepth > 0) and not _is_smooth(wire):
+        return None
+    if vdepth > 0:
+        half_width, depth = vdepth, vdepth
+    else:
+        half_width = get_gland_width(ring_cs, compression_ratio, gland_fill_ratio) / 2
+        depth = get_gland_height(ring_cs, compression_ratio)
+    try:
+        outer = _offset2D(wire, half_width)
+        inner = _offset2D(wire, -half_width)
+    except Exception as e:
+        logger.info(f"Could not offset groove path: {e}")
+        return None
+    if (len(outer) != 1) or (len(inner) != 1):
+        return None
+    outer_face = cq.Face.makeFromWires(outer[0])
+    inner_face = cq.Face.makeFromWires(inner[0])
+    if outer_face.Area() < inner_face.Area():  # which way is out depends on the direction of the path
+        outer, inner = inner, outer
+        outer_face, inner_face = inner_face, outer_face
+
+    into_surface = normal * -depth
+    if vdepth > 0:
+        return _tapered(outer_face, into_surface, 45).cut(_tapered(inner_face, into_surface, -45))
+    else:
+        return cq.Solid.extrudeLinear(cq.Face.makeFromWires(outer[0], [inner[0]]), into_surface)
+
+
+def _groove_plane(wire: cq.Wire, normal: cq.Vector) -> cq.Plane:
+    """the plane at the start of a groove path that its cross-section gets built on"""
+    cp_tangent = wire.tangentAt(0)  # tangent to cutter_path
+    cp_start = wire.positionAt(0)  # (not startPoint(), that's not always where tangentAt(0) is)
+    return cq.Plane(origin=cp_start, normal=cp_tangent, xDir=normal)
+
+
+def _make_groove_tool(wire: cq.Wire, normal: cq.Vector, vdepth: float, ring_cs: float, compression_ratio: float, gland_fill_ratio: float, construction: str) -> cq.Shape:
+    """the solid to cut away for one groove along wire, normal is that of the surface being cut into"""
+    cutter_crosssection = get_groove_cross_section(vdepth, ring_cs, compression_ratio, gland_fill_ratio)
+
+    if (construction == "offset") and _is_planar(wire, normal):
+        groove = _offset_groove(wire, normal, vdepth, ring_cs, compression_ratio, gland_fill_ratio)
+        if groove is not None:
+            return groove
+
+    to_sweep = CQ(cutter_crosssection.moved(cq.Location(_groove_plane(wire, normal)))).wires().toPending()
+    return to_sweep.sweep(wire).findSolid()
+
+
+def _path_signature(wire: cq.Wire, plane: cq.Plane) -> tuple:
+    """what a path looks like from its groove plane, so that the same path anywhere else gets the same signature"""
+    signature = []
+    for edge in wire.Edges():
+        points = (plane.toLocalCoords(edge.positionAt(t)).toTuple() for t in (0, 0.5, 1))
+        signature.append((edge.geomType(), *(tuple(round(c, 6) for c in p) for p in points)))
+    return tuple(signature)
+
+
+def _analytic_oring(wire: cq.Wire, normal: cq.Vector, ring_cs: float, compression_ratio: float) -> cq.Compound | None:
+    """
+    squished o-ring hardware built from a straight extrusion for each line in the path and a revolve for each arc
+    gives None if the path has edges that aren't lines or arcs
+    """
+    gland_height = get_gland_height(ring_cs, compression_ratio)
+    pieces = []
+    for edge in wire.Edges():
+        start = edge.positionAt(0)
+        tangent = edge.tangentAt(0)
+        ellipse = cq.Wire.makeEllipse(ring_cs / 2 * (1 + compression_ratio), gland_height / 2, start - normal * (gland_height / 2), tangent, tangent.cross(normal))
+        cross_section = cq.Face.makeFromWires(ellipse)
+        if edge.geomType() == "LINE":
+            pieces.append(cq.Solid.extrudeLinear(cross_section, edge.positionAt(1) - start))
+        elif edge.geomType() == "CIRCLE":
+            center = edge.arcCenter()
+            axis = (start - center).cross(tangent)  # so that revolving heads along the arc
+            pieces.append(cq.Solid.revolve(cross_section, math.degrees(edge.Length() / edge.radius()), center, center + axis))
+        else:
+            return None
+    return cq.Compound.makeCompound(pieces)
+
+
+def _make_oring(wire: cq.Wire, normal: cq.Vector, ring_cs: float, compression_ratio: float, fidelity: str = "full") -> cq.Shape:
+    """the squished o-ring hardware for a gland along wire"""
+    if fidelity == "centerline":
+        return wire
+    plane = _groove_plane(wire, normal)
+    key = (fidelity, ring_cs, compression_ratio, _path_signature(wire, plane))
+    if key in oring_cache:
+        oring_cache.move_to_end(key)
+        oring, oring_plane = oring_cache[key]
+        return oring.moved(cq.Location(plane) * cq.Location(oring_plane).inverse)
+
+    oring = None
+    if fidelity == "analytic":
+        oring = _analytic_oring(wire, normal, ring_cs, compression_ratio)
+    if oring is None:
+        gland_height = get_gland_height(ring_cs, compression_ratio)
+        ring_sweep_wire = CQ(plane).center(-gland_height / 2, 0).ellipse(gland_height / 2, ring_cs / 2 * (1 + compression_ratio)).wires().toPending()
+        oring = ring_sweep_wire.sweep(wire, combine=True, transition="round", isFrenet=True).findSolid()
+    oring_cache[key] = (oring, plane)
+    if len(oring_cache) > oring_cache_size:
+        oring_cache.popitem(last=False)
+    return oring
+
+
 def mk_groove(
     self: cq.Workplane,
     vdepth: float = 0,
@@ -41,6 +234,9 @@ def mk_groove(
     gland_fill_ratio: float = 0.7,
     clean: bool = True,
     hardware: cadquery.Assembly = None,
+    construction: str = None,
+    nparallel: int = 1,
+    fidelity: str = None,
 ) -> cq.Workplane:
     """
     for cutting grooves
@@ -54,54 +250,21 @@ def mk_groove(
         gland_y = the spacing in y between the centers of the gland (rounded) rectangle
         the fillets at the gland corners will be determined to ensure the ring fits, they will be equal
     if a hardware assembly is provided, o-oring hardware will be added to it
+    with detail set by fidelity: "full", "analytic" or "centerline" (see hardware_fidelity, which is the default)
+    construction is "offset" or "sweep" (see groove_construction, which is the default)
+    all the groove tools are made first (in nparallel worker processes if that's > 1) and then cut in one go
     """
-
-    def _make_one_groove(wp, _wire, _vdepth, _ring_cs, _compression_ratio, _gland_fill_ratio):
-        cp_tangent = _wire.tangentAt(0)  # tangent to cutter_path
-        cp_start = _wire.startPoint()
-        build_plane = cq.Plane(origin=cp_start, normal=cp_tangent, xDir=wp.plane.zDir)
-        if _vdepth > 0:  # we'll cut a vgroove this deep
-            half_profile = CQ(build_plane).polyline([(0, 0), (-_vdepth, 0), (0, _vdepth)]).close()
-        elif ring_cs > 0:  # we'll cut an o-ring groove, ring_cs is the diameter of the cross section of the o-ring
-            # according to https://web.archive.org/web/20220512010502/https://www.globaloring.com/o-ring-groove-design/
-            gland_height = get_gland_height(_ring_cs, _compression_ratio)
-            gland_width = get_gland_width(_ring_cs, _compression_ratio, _gland_fill_ratio)
-            half_profile = CQ(build_plane).polyline([(0, 0), (-gland_height, 0), (-gland_height, gland_width / 2), (0, gland_width / 2)]).close()
-        else:
-            raise ValueError("One of vdepth or ring_cs must be larger than 0")
-        cutter = half_profile.revolve(axisEnd=(1, 0, 0))
-        cutter_split = cutter.split(keepTop=True)
-        faces = cutter_split.faces().vals()
-        for face in faces:  # find the right face to sweep with
-            facenorm = face.normalAt()
-            dotval = facenorm.dot(cp_tangent)
-            if abs((abs(dotval) - 1)) <= 0.001:  # allow for small errors in orientation calculation
-                cutter_crosssection = face
-                break
-        else:
-            raise ValueError("Unable to find a cutter cross-section")
-
-        # make the squished o-ring hardware
-        if (ring_cs > 0) and (hardware is not None):
-            ring_sweep_wire = CQ(build_plane).center(-gland_height / 2, 0).ellipse(gland_height / 2, ring_cs / 2 * (1 + _compression_ratio)).wires().toPending()
-            hardware.add(ring_sweep_wire.sweep(_wire, combine=True, transition="round", isFrenet=True))
-
-        to_sweep = CQ(cutter_crosssection).wires().toPending()
-        return to_sweep.sweep(_wire).findSolid()
+    if construction is None:
+        construction = groove_construction
+    if fidelity is None:
+        fidelity = hardware_fidelity
 
     s = self.findSolid()
 
     if follow_pending_wires:
-        faces = self._getFaces()
-        for face in faces:
-            wire = face.outerWire()
-            logger = logging.getLogger(__name__)
+        wires = [face.outerWire() for face in self._getFaces()]
+        for wire in wires:
             logger.info(f"Made an o-ring gland for ring length {wire.Length()}mm and diameter {ring_cs}mm")
-            sweep_result = _make_one_groove(wp=self, _wire=wire, _vdepth=vdepth, _ring_cs=ring_cs, _compression_ratio=compression_ratio, _gland_fill_ratio=gland_fill_ratio)
-            s = s.cut(sweep_result)
-
-            if clean:
-                s = s.clean()
     else:  # we'll need to make our own path wire then, given the user specs
         # ensure the user passed in the right stuff
         assert vdepth == 0
@@ -116,13 +279,26 @@ def mk_groove(
         r = (wire_length - 2 * gland_x - 2 * gland_y) / (2 * math.pi - 8)
         if (2 * r > gland_x) or (2 * r > gland_y):
             raise ValueError("The o-ring circumference is too small for the given x and y gland dims")
-        logger = logging.getLogger(__name__)
         logger.info(f"Using path bend radius {r}mm, that's an uncompressed cord inner radius of {r-ring_cs/2} (and the min is {ring_cs*3})")
         wire = CQ(self.plane).rect(gland_x, gland_y).wires().val()
-        wire = wire.fillet2D(r, wire.Vertices())
-        sweep_result = _make_one_groove(wp=self, _wire=wire, _vdepth=vdepth, _ring_cs=ring_cs, _compression_ratio=compression_ratio, _gland_fill_ratio=gland_fill_ratio)
-        s = s.cut(sweep_result)
+        wires = [wire.fillet2D(r, wire.Vertices())]
+
+    normal = self.plane.zDir
+    tool_args = [(wire, normal, vdepth, ring_cs, compression_ratio, gland_fill_ratio, construction) for wire in wires]
+    if (nparallel > 1) and (len(wires) > 1):
+        register_cq_helper()  # register picklers
+        with concurrent.futures.ProcessPoolExecutor(max_workers=nparallel, initializer=register_cq_helper) as executor:
+            tools = list(executor.map(_make_groove_tool, *zip(*tool_args)))
+    else:
+        tools = [_make_groove_tool(*args) for args in tool_args]
+
+    # make the squished o-ring hardware
+    if (ring_cs > 0) and (hardware is not None):
+        for wire in wires:
+            hardware.add(CQ(_make_oring(wire, normal, ring_cs, compression_ratio, fidelity)))
 
+    if tools:
+        s = s.cut(*tools)
         if clean:
             s = s.clean()
 
@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 """Lid with an o-ring sealed window for an environment chamber."""
 
+import inspect
 import logging
 import math
 import pathlib
-from typing import Optional, Tuple
+import itertools
+import concurrent.futures
+from typing import Callable, Optional, Sequence, Tuple
 
 import cadquery as cq
 import cq_warehouse.fastener as cqf
@@ -79,6 +82,14 @@ class LidAssemblyBuilder:
     # the corners to fasten the lid to the chamber
     csink_corner_bolt_extra_thread = 5
 
+    # the attributes each part depends on, their builders only run again if one of these changes
+    # (fasteners are represented by the attributes they get picked with)
+    _fastener_dependencies = ("corner_bolt_thread", "corner_bolt_style", "csink_corner_bolt_extra_thread", "support_bolt_size", "lid_t_under_support_screw", "support_screw_air_gap", "no_threads")
+    _window_ap_dependencies = ("window_ap_l", "window_ap_w", "window_ap_r", "window_aperture_offset")
+    _lid_plate_dependencies = ("length", "width", "lid_t", "support_t", "corner_bolt_offset", "corner_bolt_xys", "socket_clearance", "support_bolt_xys", "chamber_fillet", "window_recess_l", "window_recess_w", "window_recess_r", "window_t", *_fastener_dependencies, *_window_ap_dependencies)
+    _groove_dependencies = ("oring_cs", "oring_id", "oring_gland_x", "oring_gland_y", "compression_ratio", "gland_fill_ratio")
+    _support_dependencies = ("length", "width", "lid_t", "support_t", "corner_bolt_xys", "socket_clearance", "support_bolt_xys", "chamber_fillet", "chamber_chamfer", *_fastener_dependencies, *_window_ap_dependencies)
+
     def __init__(
         self,
         length: float,
@@ -246,35 +257,22 @@ class LidAssemblyBuilder:
         logger.info(f"minimum o-ring id = {((2 * self.window_ap_l + 2 * self.window_ap_w + - 8 * self.window_ap_r + np.pi * 2 * self.window_ap_r) / np.pi) + 2 * self.min_oring_edge_gap} mm")
         logger.info(f"selected o-ring id = {self.oring_id} mm")
 
-        # calculate a constant gap between the window aperture edge and the centre line of the o-ring
-        oring_gap = (math.pi * (self.oring_id + self.oring_cs) - 2 * self.window_ap_l - 2 * self.window_ap_w + (8 - 2 * math.pi) * self.window_ap_r) / (2 * math.pi)
+        layout = self._oring_gland_layout(self.window_ap_l, self.window_ap_w, self.window_ap_r, self.oring_id, self.oring_cs, self.compression_ratio, self.gland_fill_ratio, self.min_oring_edge_gap)
 
-        # use it to determine the gland dimensions (these are o-ring/groove
+        # the gland dimensions (these are o-ring/groove
         # centre-to-centre along each axis, not inner edge-to-edge)
-        self.oring_gland_x = self.window_ap_l + 2 * oring_gap
-        self.oring_gland_y = self.window_ap_w + 2 * oring_gap
-
-        # check the uncompressed bend radius
-        # if the bend radius is below the minimum, set it to the minimum and recalculate the gland dimensions
-        oring_bend_r = self.window_ap_r + oring_gap - self.oring_cs / 2
-        min_oring_bend_r = self.oring_cs * (tb.constants.oring_grooves["corner_r_fraction"])
-        if oring_bend_r < min_oring_bend_r:
-            logger.warning(f"WARNING: The o-ring bend radius with a constant edge gap is too low (actual = {oring_bend_r} mm, minimum = {min_oring_bend_r} mm). Retrying with minimum bend radius.")
-
-            oring_bend_r = min_oring_bend_r
-            oring_gap = (math.pi * (self.oring_id + self.oring_cs) - 2 * self.window_ap_l - 2 * self.window_ap_w + (8 - 2 * math.pi) * (min_oring_bend_r + self.oring_cs / 2)) / 8
+        self.oring_gland_x = float(layout["oring_gland_x"])
+        self.oring_gland_y = float(layout["oring_gland_y"])
 
-            # changing the bend radius will cause the gap in the corners to be different to the sides
-            self.oring_gland_x = self.window_ap_l + 2 * oring_gap
-            self.oring_gland_y = self.window_ap_w + 2 * oring_gap
+        if layout["bend_r_too_small"]:
+            logger.warning(f"WARNING: The o-ring bend radius with a constant edge gap is too low (actual = {layout['constant_gap_bend_r']} mm, minimum = {layout['min_oring_bend_r']} mm). Retrying with minimum bend radius.")
 
         # report inner wall thickness between oring gland and window aperture along sides
-        oring_gland_w = tb.groovy.get_gland_width(self.oring_cs, self.compression_ratio, self.gland_fill_ratio)
-        oring_ap_edge_gap = oring_gap - oring_gland_w / 2
+        oring_ap_edge_gap = float(layout["oring_edge_gap"])
         logger.info(f"o-ring inner wall thickness along sides = {oring_ap_edge_gap} mm")
 
         # report smallest inner wall thickness between oring gland and window aperture in corners
-        oring_corner_gap = (1 - np.sqrt(2)) * (oring_bend_r + self.oring_cs / 2 - oring_gland_w / 2 - self.window_ap_r) + np.sqrt(2) * oring_ap_edge_gap
+        oring_corner_gap = float(layout["oring_corner_gap"])
         logger.info(f"o-ring inner wall thickness in corners = {oring_corner_gap} mm")
 
         # check if wall thickness around groove is below minimum required
@@ -286,8 +284,8 @@ class LidAssemblyBuilder:
             self.window_l = self.window_size[0]
             self.window_w = self.window_size[1]
         else:
-            self.window_l = np.ceil(self.window_ap_l + 2 * self.min_oring_edge_gap + 2 * oring_ap_edge_gap + 2 * oring_gland_w)
-            self.window_w = np.ceil(self.window_ap_w + 2 * self.min_oring_edge_gap + 2 * oring_ap_edge_gap + 2 * oring_gland_w)
+            self.window_l = np.float64(layout["window_l"])
+            self.window_w = np.float64(layout["window_w"])
 
         logger.info(f"window length = {self.window_l} mm")
         logger.info(f"window width = {self.window_w} mm")
@@ -300,9 +298,10 @@ class LidAssemblyBuilder:
         support_bolt_length = self._get_std_csink_screw_length(ideal_support_bolt_length)
         logger.info(f"Support bolt length = {support_bolt_length} mm")
 
-        self.support_bolt = cqf.CounterSunkScrew(
-            size=self.support_bolt_size,
-            fastener_type="iso14581",
+        self.support_bolt = tb.fasteners.get_fastener(
+            cqf.CounterSunkScrew,
+            self.support_bolt_size,
+            "iso14581",
             length=support_bolt_length,
             simple=self.no_threads,
         )
@@ -401,17 +400,19 @@ class LidAssemblyBuilder:
         # get chamber fastener
         if self.corner_bolt_style == "nut":
             # HFFN-M5-A2
-            self.chamber_fastener = cqf.HexNutWithFlange(
-                size=self.corner_bolt_thread,
-                fastener_type="din1665",
+            self.chamber_fastener = tb.fasteners.get_fastener(
+                cqf.HexNutWithFlange,
+                self.corner_bolt_thread,
+                "din1665",
                 simple=self.no_threads,
             )
         elif self.corner_bolt_style == "countersink":
             ideal_corner_bolt_length = self.lid_t + self.support_t + self.csink_corner_bolt_extra_thread
             corner_bolt_length = self._get_std_csink_screw_length(ideal_corner_bolt_length)
-            self.chamber_fastener = cqf.CounterSunkScrew(
-                size=self.corner_bolt_thread,
-                fastener_type="iso14581",
+            self.chamber_fastener = tb.fasteners.get_fastener(
+                cqf.CounterSunkScrew,
+                self.corner_bolt_thread,
+                "iso14581",
                 length=corner_bolt_length,
                 simple=self.no_threads,
             )
@@ -422,6 +423,7 @@ class LidAssemblyBuilder:
         # --- misc
         self.socket_clearance = self.socket_clearances[self.corner_bolt_size]
 
+    @tb.memo.depends_on(*_lid_plate_dependencies, *_groove_dependencies)
     def _build_lid(self) -> Tuple[cq.Workplane, cq.Assembly, cq.Assembly]:
         """Build the lid.
 
@@ -434,12 +436,38 @@ class LidAssemblyBuilder:
         orings : cq.Assembly
             Assembly of o-rings.
         """
+        lid, chamber_nuts = self._build_lid_plate()
+
+        # cut o-ring groove
+        orings = cq.Assembly(None)
+        cq.Workplane.mk_groove = tb.groovy.mk_groove
+
+        if self.corner_bolt_style == "nut":
+            lid = cq.CQ(lid.findSolid()).faces(">Z[-3]").workplane(centerOption="CenterOfBoundBox")
+
+        if self.corner_bolt_style == "countersink":
+            lid = cq.CQ(lid.findSolid()).faces(">Z[-2]").workplane(centerOption="CenterOfBoundBox")
+
+        lid = lid.mk_groove(ring_cs=self.oring_cs, follow_pending_wires=False, ring_id=self.oring_id, gland_x=self.oring_gland_x, gland_y=self.oring_gland_y, compression_ratio=self.compression_ratio, gland_fill_ratio=self.gland_fill_ratio, hardware=orings)
+
+        return (lid, chamber_nuts, orings)
+
+    @tb.memo.depends_on(*_lid_plate_dependencies)
+    def _build_lid_plate(self) -> Tuple[cq.Workplane, cq.Assembly]:
+        """Build the lid without its o-ring groove.
+
+        Returns
+        -------
+        lid : cq.Workplane
+            Lid object.
+        chamber_nuts : cq.Assembly
+            Assembly of chamber nuts.
+        """
         # create hardware assemblies
         chamber_nuts = cq.Assembly(None)
-        orings = cq.Assembly(None)
 
-        # create lid plate
-        lid = cq.Workplane("XY").box(self.length, self.width, self.lid_t)
+        # create lid plate (memoized, so variants only rebuild from where they differ)
+        lid = tb.memo.memo(cq.Workplane("XY")).box(self.length, self.width, self.lid_t)
 
         if self.corner_bolt_style == "nut":
             # make the socket clearance ears on the corners
@@ -489,7 +517,7 @@ class LidAssemblyBuilder:
         lid = lid.edges("|Z").fillet(self.chamber_fillet)
 
         # cut aperture for light transmission
-        window_ap = cq.Workplane("XY").box(self.window_ap_l, self.window_ap_w, self.lid_t).edges("|Z").fillet(self.window_ap_r).translate((self.window_aperture_offset[0], self.window_aperture_offset[1], 0))
+        window_ap = tb.memo.memo(cq.Workplane("XY")).box(self.window_ap_l, self.window_ap_w, self.lid_t).edges("|Z").fillet(self.window_ap_r).translate((self.window_aperture_offset[0], self.window_aperture_offset[1], 0))
         lid = lid.cut(window_ap)
 
         # cut window recess
@@ -497,19 +525,9 @@ class LidAssemblyBuilder:
         window_recess = window_recess.translate((self.window_aperture_offset[0], self.window_aperture_offset[1], self.lid_t / 2 - self.window_t / 2))
         lid = lid.cut(window_recess)
 
-        # cut o-ring groove
-        cq.Workplane.mk_groove = tb.groovy.mk_groove
-
-        if self.corner_bolt_style == "nut":
-            lid = cq.CQ(lid.findSolid()).faces(">Z[-3]").workplane(centerOption="CenterOfBoundBox")
-
-        if self.corner_bolt_style == "countersink":
-            lid = cq.CQ(lid.findSolid()).faces(">Z[-2]").workplane(centerOption="CenterOfBoundBox")
-
-        lid = lid.mk_groove(ring_cs=self.oring_cs, follow_pending_wires=False, ring_id=self.oring_id, gland_x=self.oring_gland_x, gland_y=self.oring_gland_y, compression_ratio=self.compression_ratio, gland_fill_ratio=self.gland_fill_ratio, hardware=orings)
-
-        return (lid, chamber_nuts, orings)
+        return (lid, chamber_nuts)
 
+    @tb.memo.depends_on(*_support_dependencies)
     def _build_support(self) -> Tuple[cq.Workplane, cq.Assembly, cq.Assembly]:
         """Build the window support.
 
@@ -526,8 +544,8 @@ class LidAssemblyBuilder:
         support_bolts = cq.Assembly(None)
         chamber_bolts = cq.Assembly(None)
 
-        # create window support plate
-        window_support = cq.Workplane("XY").box(self.length, self.width, self.support_t)
+        # create window support plate (memoized, so variants only rebuild from where they differ)
+        window_support = tb.memo.memo(cq.Workplane("XY")).box(self.length, self.width, self.support_t)
 
         # fillet side edges
         window_support = window_support.edges("|Z").fillet(self.chamber_fillet)
@@ -548,7 +566,7 @@ class LidAssemblyBuilder:
                 window_support = window_support.cut(corner)
 
         # cut window aperture
-        window_ap = cq.Workplane("XY").box(self.window_ap_l, self.window_ap_w, self.support_t).edges("|Z").fillet(self.window_ap_r).translate((self.window_aperture_offset[0], self.window_aperture_offset[1], 0))
+        window_ap = tb.memo.memo(cq.Workplane("XY")).box(self.window_ap_l, self.window_ap_w, self.support_t).edges("|Z").fillet(self.window_ap_r).translate((self.window_aperture_offset[0], self.window_aperture_offset[1], 0))
         window_support = window_support.cut(window_ap)
 
         # add full thickness chamfer on window of support piece
@@ -566,6 +584,7 @@ class LidAssemblyBuilder:
 
         return (window_support, chamber_bolts, support_bolts)
 
+    @tb.memo.depends_on("window_l", "window_w", "window_t", "window_aperture_offset", "lid_t")
     def _build_window(self) -> cq.Workplane:
         """Build the window.
 
@@ -579,6 +598,7 @@ class LidAssemblyBuilder:
 
         return window
 
+    @tb.memo.depends_on()
     def _drilled_corner_cube(self, length: float, width: float, depth: float, radius: float) -> cq.Workplane:
         """Create a cube with drilled out corners that can be machined.
 
@@ -598,7 +618,7 @@ class LidAssemblyBuilder:
         cube : cq.Workplane
             cube with drilled corners
         """
-        cube = cq.Workplane("XY").box(length, width, depth)
+        cube = tb.memo.memo(cq.Workplane("XY")).box(length, width, depth)
         cube = cube.edges("|Z").chamfer(radius / 2)  # work around for a BUG in OCCT
         cube = cube.faces("<Z").workplane(centerOption="CenterOfBoundBox")
         cube = cube.rect(
@@ -611,6 +631,202 @@ class LidAssemblyBuilder:
 
         return cube
 
+    @staticmethod
+    def _oring_gland_layout(window_ap_l, window_ap_w, window_ap_r, oring_id, oring_cs, compression_ratio, gland_fill_ratio, min_oring_edge_gap) -> dict:
+        """Lay out the o-ring gland around the window aperture.
+
+        Works elementwise, so the arguments can be plain numbers (one lid, see
+        _calculate_reusable_params) or arrays (many variants, see check_variants).
+
+        Returns
+        -------
+        layout : dict
+            "oring_gland_x", "oring_gland_y" (gland centre-to-centre along each axis),
+            "oring_gland_w", the wall thicknesses "oring_edge_gap" (along the sides) and
+            "oring_corner_gap", the auto-sized window "window_l" and "window_w", and
+            "bend_r_too_small" (whether a constant edge gap bent the o-ring tighter than
+            "min_oring_bend_r", at "constant_gap_bend_r", so the minimum was used instead).
+        """
+        # calculate a constant gap between the window aperture edge and the centre line of the o-ring
+        oring_gap = (np.pi * (oring_id + oring_cs) - 2 * window_ap_l - 2 * window_ap_w + (8 - 2 * np.pi) * window_ap_r) / (2 * np.pi)
+
+        # check the uncompressed bend radius
+        # if the bend radius is below the minimum, use the minimum and recalculate the gap
+        # (changing the bend radius will cause the gap in the corners to be different to the sides)
+        constant_gap_bend_r = window_ap_r + oring_gap - oring_cs / 2
+        min_oring_bend_r = oring_cs * tb.constants.oring_grooves["corner_r_fraction"]
+        too_small = constant_gap_bend_r < min_oring_bend_r
+        oring_bend_r = np.where(too_small, min_oring_bend_r, constant_gap_bend_r)
+        oring_gap = np.where(too_small, (np.pi * (oring_id + oring_cs) - 2 * window_ap_l - 2 * window_ap_w + (8 - 2 * np.pi) * (min_oring_bend_r + oring_cs / 2)) / 8, oring_gap)
+
+        oring_gland_w = tb.groovy.get_gland_width(oring_cs, compression_ratio, gland_fill_ratio)
+        oring_edge_gap = oring_gap - oring_gland_w / 2
+        oring_corner_gap = (1 - np.sqrt(2)) * (oring_bend_r + oring_cs / 2 - oring_gland_w / 2 - window_ap_r) + np.sqrt(2) * oring_edge_gap
+
+        return {
+            "oring_gland_x": window_ap_l + 2 * oring_gap,
+            "oring_gland_y": window_ap_w + 2 * oring_gap,
+            "oring_gland_w": oring_gland_w,
+            "oring_edge_gap": oring_edge_gap,
+            "oring_corner_gap": oring_corner_gap,
+            "window_l": np.ceil(window_ap_l + 2 * min_oring_edge_gap + 2 * oring_edge_gap + 2 * oring_gland_w),
+            "window_w": np.ceil(window_ap_w + 2 * min_oring_edge_gap + 2 * oring_edge_gap + 2 * oring_gland_w),
+            "bend_r_too_small": too_small,
+            "constant_gap_bend_r": constant_gap_bend_r,
+            "min_oring_bend_r": min_oring_bend_r,
+        }
+
+    @classmethod
+    def check_variants(cls, variants: dict[str, Sequence]) -> dict[str, np.ndarray]:
+        """Run the analytic checks of _calculate_reusable_params over many variants at once.
+
+        Parameters
+        ----------
+        variants : dict
+            Maps __init__ parameter names to sequences of values, one per variant
+            (all the same length). Parameters left out take their defaults.
+
+        Returns
+        -------
+        checks : dict of np.ndarray
+            "feasible" (bool), "reason" (why not, "" if feasible) and the derived
+            dimensions "oring_gland_x", "oring_gland_y", "oring_edge_gap",
+            "oring_corner_gap", "window_l" and "window_w", one entry per variant.
+        """
+        defaults = {name: p.default for name, p in inspect.signature(cls.__init__).parameters.items() if p.default is not inspect.Parameter.empty}
+        n = len(next(iter(variants.values())))
+
+        def column(name, dtype=float):
+            values = variants.get(name, [defaults.get(name)] * n)
+            if dtype is object:
+                col = np.empty(n, dtype=object)
+                col[:] = list(values)
+                return col
+            return np.asarray(values, dtype=dtype)
+
+        length, width = column("length"), column("width")
+        lid_t, support_t, window_t = column("lid_t"), column("support_t"), column("window_t")
+        buffer = column("substrate_array_window_buffer")
+        offsets = np.array([tuple(o) for o in column("window_aperture_offset", object)], dtype=float).reshape(n, 2)
+        window_sizes = column("window_size", object)
+        oring_sizes = column("oring_size", object)
+        styles = column("corner_bolt_style", object)
+        bolt_sizes = np.array([thread.split("-")[0] for thread in column("corner_bolt_thread", object)], dtype=object)
+
+        window_ap_l = column("substrate_array_l") + 2 * buffer
+        window_ap_w = column("substrate_array_w") + 2 * buffer
+        window_ap_r = buffer
+
+        # o-ring gland, laid out like _calculate_reusable_params does (unknown sizes get nans)
+        known_oring = np.array([size in tb.constants.std_orings for size in oring_sizes])
+        oring_cs = np.array([tb.constants.std_orings[size]["cs"] if known else np.nan for size, known in zip(oring_sizes, known_oring)])
+        oring_id = np.array([tb.constants.std_orings[size]["id"] if known else np.nan for size, known in zip(oring_sizes, known_oring)])
+        layout = cls._oring_gland_layout(window_ap_l, window_ap_w, window_ap_r, oring_id, oring_cs, cls.compression_ratio, cls.gland_fill_ratio, cls.min_oring_edge_gap)
+        oring_gland_x, oring_gland_y, oring_gland_w = layout["oring_gland_x"], layout["oring_gland_y"], layout["oring_gland_w"]
+        oring_edge_gap, oring_corner_gap = layout["oring_edge_gap"], layout["oring_corner_gap"]
+
+        # window
+        auto_window = np.array([size is None for size in window_sizes])
+        given_window = np.array([(np.nan, np.nan) if size is None else tuple(size) for size in window_sizes], dtype=float).reshape(n, 2)
+        window_l = np.where(auto_window, layout["window_l"], given_window[:, 0])
+        window_w = np.where(auto_window, layout["window_w"], given_window[:, 1])
+
+        # screws need to come in a standard length
+        shortest_screw = min(cls.valid_csink_bolt_lengths)
+        support_screw_ok = lid_t + support_t - cls.lid_t_under_support_screw - cls.support_screw_air_gap >= shortest_screw
+        corner_screw_ok = (styles != "countersink") | (lid_t + support_t + cls.csink_corner_bolt_extra_thread >= shortest_screw)
+
+        # the first check a variant fails is its reason
+        failures = [
+            (~np.isin(styles, cls.valid_corner_bolt_styles), "corner_bolt_style"),
+            (~np.isin(bolt_sizes, list(cls.socket_clearances)), "corner_bolt_thread"),
+            (~known_oring, "oring_size"),
+            (~(support_screw_ok & corner_screw_ok), "screw_length"),
+            (~((oring_edge_gap >= cls.min_oring_edge_gap) & (oring_corner_gap >= cls.min_oring_edge_gap)), "thin_wall"),
+            (~((oring_gland_x + oring_gland_w) / 2 + np.abs(offsets[:, 0]) + cls.min_oring_edge_gap <= length / 2) | ~((oring_gland_y + oring_gland_w) / 2 + np.abs(offsets[:, 1]) + cls.min_oring_edge_gap <= width / 2), "oring_off_plate"),
+            (~((window_l + cls.window_recess_tol) / 2 + np.abs(offsets[:, 0]) < length / 2) | ~((window_w + cls.window_recess_tol) / 2 + np.abs(offsets[:, 1]) < width / 2) | ~(window_t < lid_t), "window_recess"),
+        ]
+        reason = np.full(n, "", dtype=object)
+        for failed, why in reversed(failures):
+            reason[failed] = why
+
+        return {
+            "feasible": reason == "",
+            "reason": reason,
+            "oring_gland_x": oring_gland_x,
+            "oring_gland_y": oring_gland_y,
+            "oring_edge_gap": oring_edge_gap,
+            "oring_corner_gap": oring_corner_gap,
+            "window_l": window_l,
+            "window_w": window_w,
+        }
+
+    @classmethod
+    def sweep(cls, grid: dict[str, Sequence], nparallel: int = 1, choose: Optional[Callable[[dict], bool]] = None, **fixed) -> Tuple[list[dict], dict[int, cq.Assembly]]:
+        """Build every feasible combination of a grid of parameters.
+
+        The analytic checks (see check_variants) run first over the whole grid and
+        infeasible combinations never get any geometry. The rest are built in order
+        (so neighbouring variants share memoized plates and cached grooves), in a
+        pool of nparallel processes if nparallel > 1. Fasteners are made once up
+        front so every worker finds them in the cache.
+
+        Parameters
+        ----------
+        grid : dict
+            Maps __init__ parameter names to the values to sweep them over.
+        nparallel : int
+            Number of processes to build in.
+        choose : callable
+            Given a built variant's row of the table, whether to keep its assembly.
+            All built assemblies are kept if not given.
+        **fixed
+            Other __init__ parameters, the same for every variant.
+
+        Returns
+        -------
+        table : list of dict
+            One row per combination with its parameters, the check results and for
+            built variants "lid_volume", "support_volume" and "window_volume".
+        assemblies : dict
+            The chosen assemblies, keyed by row index in the table.
+        """
+        names = list(grid)
+        combos = [dict(fixed, **dict(zip(names, values))) for values in itertools.product(*grid.values())]
+        if not combos:
+            return [], {}
+
+        checks = cls.check_variants({name: [combo[name] for combo in combos] for name in combos[0]})
+        table = [dict(combo, **{key: checks[key][i].item() if isinstance(checks[key][i], np.generic) else checks[key][i] for key in checks}) for i, combo in enumerate(combos)]
+        to_build = [i for i, row in enumerate(table) if row["feasible"]]
+        logger.info(f"Sweep: {len(to_build)} of {len(table)} variants pass the checks")
+
+        # make each distinct set of fasteners once, before any workers start
+        fastener_params = ("lid_t", "support_t", "corner_bolt_thread", "corner_bolt_style", "no_threads")
+        for i in {tuple(combos[i].get(p) for p in fastener_params): i for i in to_build}.values():
+            cls(**combos[i])._calculate_reusable_params()
+
+        if nparallel > 1:
+            tb.cq_serialize.register()
+            with concurrent.futures.ProcessPoolExecutor(max_workers=nparallel, initializer=tb.cq_serialize.register) as executor:
+                built = list(executor.map(_sweep_build, [combos[i] for i in to_build], chunksize=max(1, math.ceil(len(to_build) / nparallel))))
+        else:
+            built = [_sweep_build(combos[i]) for i in to_build]
+
+        assemblies = {}
+        for i, (volumes, assembly) in zip(to_build, built):
+            table[i].update(volumes)
+            if (choose is None) or choose(table[i]):
+                assemblies[i] = assembly
+        return table, assemblies
+
+
+def _sweep_build(kwargs: dict) -> Tuple[dict, cq.Assembly]:
+    """build one variant of a LidAssemblyBuilder.sweep(), returns the volumes of its parts and its assembly"""
+    assembly = LidAssemblyBuilder(**kwargs).build()
+    volumes = {f"{name}_volume": assembly.objects[name].toCompound().Volume() for name in ("lid", "support", "window")}
+    return volumes, assembly
+
 
 if (__name__ == "__main__") or (have_so is True):
     # set output parameters
@@ -0,0 +1,285 @@
+import os
+import sys
+import time
+import collections
+import types
+import inspect
+import marshal
+import pathlib
+import functools
+import pickle
+import hashlib
+import logging
+import importlib.metadata
+import numpy as np
+import cadquery as cq
+from . import utilities as u
+from .cq_serialize import register as register_cq_helper
+
+"""
+memoized Workplane chains for building variants of a part
+every operation on a MemoWorkplane gets a key made from its parent's key, the method name, its code and its arguments,
+so two chains that start the same way share their results up to the first operation that differs,
+within one run (memo_cache) and across runs (the on-disk "memo" cache)
+a chain's first key also covers the cadquery and cq_warehouse versions and the toolbox's sources,
+so changing any of those (or a method's code) means building again instead of getting stale geometry
+"""
+
+# setup logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+ch = logging.StreamHandler()
+ch.setLevel(logging.DEBUG)
+formatter = logging.Formatter(("%(asctime)s|%(name)s|%(levelname)s|" "%(message)s"))
+ch.setFormatter(formatter)
+logger.addHandler(ch)
+
+# results of the operations we've already done in this process, as (plane, stack) (most recently used last, at most memo_cache_size of them)
+# keyed by the operation's key (see MemoWorkplane)
+memo_cache: collections.OrderedDict[str, tuple[cq.Plane, list[cq.Shape]]] = collections.OrderedDict()
+memo_cache_size = 1024
+
+# results of depends_on() methods we've already run in this process (most recently used last, at most method_cache_size of them)
+# keyed by a digest of (method's qualified name, the values of the attributes it depends on, its arguments)
+method_cache: collections.OrderedDict[str, object] = collections.OrderedDict()
+method_cache_size = 256
+
+# operations quicker than this (in s) don't get written to the disk cache
+disk_threshold = 0.05
+
+# these don't make a new stage of the part so they're passed straight through
+_passthrough = {"newObject", "val", "vals", "size", "all", "first", "last", "item", "end", "tag", "findSolid", "toOCC", "toSvg", "exportSvg", "largestDimension", "sketch", "placeSketch", "each", "eachpoint", "invoke", "apply", "export", "filter", "map", "sort", "toPending", "ctx"}
+
+# these change the stack in place (and return self)
+_mutating = {"add"}
+
+_depth = 0  # how many memoized operations deep we are (operations called by operations aren't memoized on their own)
+
+# memoized versions of Workplane's methods, keyed by the method they wrap
+_wrappers: dict[types.FunctionType, types.FunctionType] = {}
+
+
+class _Unkeyable(Exception):
+    """an argument that can't go into a key (callables, assemblies that get added to etc.)"""
+
+
+def _shape_digest(shape: cq.Shape) -> str:
+    register_cq_helper()
+    return hashlib.sha1(pickle.dumps(cq.Shape.cast(shape.wrapped))).hexdigest()
+
+
+def _token(arg):
+    """a stand-in for arg that's the same for equal arguments, across runs"""
+    if arg is None or isinstance(arg, (bool, int, str)):
+        return arg
+    elif isinstance(arg, (float, np.floating)):
+        return round(float(arg), 9)
+    elif isinstance(arg, np.integer):
+        return int(arg)
+    elif isinstance(arg, np.ndarray):
+        return _token(arg.tolist())
+    elif isinstance(arg, (tuple, list)):
+        return tuple(_token(a) for a in arg)
+    elif isinstance(arg, (set, frozenset)):
+        return ("set", tuple(sorted(_token(a) for a in arg)))
+    elif isinstance(arg, dict):
+        return tuple(sorted((k, _token(v)) for k, v in arg.items()))
+    elif isinstance(arg, cq.Vector):
+        return ("Vector", _token(arg.toTuple()))
+    elif isinstance(arg, cq.Location):
+        return ("Location", _token(arg.toTuple()))
+    elif isinstance(arg, cq.Plane):
+        return ("Plane", _token((arg.origin, arg.xDir, arg.zDir)))
+    elif isinstance(arg, cq.Shape):
+        return ("Shape", _shape_digest(arg))
+    elif isinstance(arg, MemoWorkplane) and arg._memo_key is not None:
+        return ("Workplane", arg._memo_key)
+    elif isinstance(arg, cq.Workplane) and all(isinstance(o, cq.Shape) for o in arg.objects):
+        return ("Workplane", _token(arg.plane), _token(arg.objects))
+    raise _Unkeyable(type(arg).__name__)
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _environment() -> str:
+    """a digest of what every operation's result can depend on besides its own code and arguments"""
+    try:
+        warehouse_version = importlib.metadata.version("cq_warehouse")
+    except importlib.metadata.PackageNotFoundError:
+        warehouse_version = getattr(sys.modules.get("cq_warehouse"), "__version__", None)
+    sources = b"".join(file.read_bytes() for file in sorted(pathlib.Path(__file__).parent.glob("*.py")))
+    return _digest(cq.__version__, warehouse_version, hashlib.sha1(sources).hexdigest())
+
+
+def _code_digest(method: types.FunctionType) -> str:
+    """a digest of method's code and default arguments, so changing either gives its operations new keys"""
+    try:
+        code = inspect.getsource(method).encode()
+    except (OSError, TypeError):  # no source around (e.g. defined in an interactive session)
+        code = marshal.dumps(method.__code__)
+    return _digest(hashlib.sha1(code).hexdigest(), _token(method.__defaults__), _token(method.__kwdefaults__))
+
+
+def _remember(key: str, plane: cq.Plane, shapes: list[cq.Shape]):
+    memo_cache[key] = (plane, shapes)
+    if len(memo_cache) > memo_cache_size:
+        memo_cache.popitem(last=False)
+
+
+def _lookup(key: str) -> tuple[cq.Plane, list[cq.Shape]] | None:
+    if key in memo_cache:
+        memo_cache.move_to_end(key)
+        return memo_cache[key]
+    cache_file = u.get_cache_dir("memo") / f"{key}.pkl"
+    if not cache_file.is_file():
+        return None
+    register_cq_helper()
+    with open(cache_file, "rb") as f:
+        origin, x_dir, normal, shapes = pickle.load(f)
+    _remember(key, cq.Plane(origin, x_dir, normal), shapes)
+    return memo_cache[key]
+
+
+def _store(key: str, wp: cq.Workplane, to_disk: bool):
+    _remember(key, wp.plane, list(wp.objects))
+    if to_disk:
+        register_cq_helper()
+        cache_file = u.get_cache_dir("memo") / f"{key}.pkl"
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump((wp.plane.origin.toTuple(), wp.plane.xDir.toTuple(), wp.plane.zDir.toTuple(), list(wp.objects)), f)
+        tmp_file.replace(cache_file)
+
+
+def _memoized(name: str, method):
+    try:
+        code = _code_digest(method)
+    except _Unkeyable:  # unkeyable defaults
+        code = None
+
+    def wrapper(self, *args, **kwargs):
+        global _depth
+        if _depth > 0:
+            return method(self, *args, **kwargs)
+
+        key = None
+        uses_tags = name == "workplaneFromTagged" or kwargs.get("tag") is not None  # tagged objects aren't part of the key
+        if (self._memo_key is not None) and (code is not None) and not uses_tags:
+            try:
+                key = _digest(self._memo_key, name, code, _token(args), _token(kwargs))
+            except _Unkeyable:
+                pass
+
+        if (key is not None) and (name not in _mutating) and ((cached := _lookup(key)) is not None):
+            plane, shapes = cached
+            rv = self.newObject(shapes)
+            rv.plane = plane
+            rv._memo_key = key
+            # the (skipped) operation would have used up anything pending
+            self.ctx.pendingWires = []
+            self.ctx.pendingEdges = []
+            return rv
+
+        t0 = time.perf_counter()
+        _depth += 1
+        try:
+            rv = method(self, *args, **kwargs)
+        finally:
+            _depth -= 1
+
+        if rv is self:
+            if name in _mutating:
+                self._memo_key = key
+        elif isinstance(rv, MemoWorkplane) and not _is_ancestor(rv, self):
+            rv._memo_key = key
+            settled = not (rv.ctx.pendingWires or rv.ctx.pendingEdges)  # nothing that lives outside the stack
+            if (key is not None) and settled and rv.objects and all(isinstance(o, cq.Shape) for o in rv.objects):
+                _store(key, rv, time.perf_counter() - t0 > disk_threshold)
+        return rv
+
+    wrapper.__name__ = name
+    wrapper.__qualname__ = f"MemoWorkplane.{name}"
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+def _is_ancestor(wp: cq.Workplane, of: cq.Workplane) -> bool:
+    parent = of.parent
+    while parent is not None:
+        if parent is wp:
+            return True
+        parent = parent.parent
+    return False
+
+
+def _workplane_method(name: str) -> types.FunctionType | None:
+    """what cq.Workplane has for name right now, if that's a plain method"""
+    for cls in cq.Workplane.__mro__:
+        if name in vars(cls):
+            method = vars(cls)[name]
+            return method if isinstance(method, types.FunctionType) else None
+    return None
+
+
+class MemoWorkplane(cq.Workplane):
+    """
+    a Workplane whose operations remember their results (see memo())
+    every public Workplane method is memoized, including ones cadquery plugins add or replace,
+    whenever they were added: methods are looked up on cq.Workplane when they're used
+    operations that take things which can't be keyed (callables, assemblies to put hardware in) just run normally,
+    but then nothing after them in the chain is memoized
+    """
+
+    _memo_key: str | None = None
+
+    def __getattribute__(self, name):
+        if (name[0] != "_") and (name not in _passthrough) and ((method := _workplane_method(name)) is not None):
+            if method not in _wrappers:
+                _wrappers[method] = _memoized(name, method)
+            return types.MethodType(_wrappers[method], self)
+        return super().__getattribute__(name)
+
+
+def memo(wp: cq.Workplane) -> MemoWorkplane:
+    """continue wp's chain with its operations memoized (see MemoWorkplane)"""
+    rv = MemoWorkplane()
+    rv.plane = wp.plane
+    rv.parent = wp
+    rv.objects = list(wp.objects)
+    rv.ctx = wp.ctx
+    try:
+        rv._memo_key = _digest(_environment(), _token(wp.plane), _token(wp.objects))
+    except _Unkeyable:
+        pass
+    return rv
+
+
+def depends_on(*attributes: str):
+    """
+    memoize a method by the values of the instance attributes it says it depends on (and its arguments),
+    so any instance with the same values gets the same result back without running it again
+    if any of those can't be keyed the method just runs
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                key = _digest(method.__qualname__, _token([getattr(self, attribute) for attribute in attributes]), _token(args), _token(kwargs))
+            except _Unkeyable:
+                return method(self, *args, **kwargs)
+            if key in method_cache:
+                method_cache.move_to_end(key)
+            else:
+                method_cache[key] = method(self, *args, **kwargs)
+                if len(method_cache) > method_cache_size:
+                    method_cache.popitem(last=False)
+            return method_cache[key]
+
+        wrapper.depends_on = attributes
+        return wrapper
+
+    return decorator
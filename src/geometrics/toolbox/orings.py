@@ -0,0 +1,71 @@
+import numpy as np
+from . import constants as c
+
+"""
+picks standard o-rings from constants.std_orings for a gland path,
+checked against the groove design rules in constants.oring_grooves
+everything is done on numpy arrays over the whole table (and optionally over many paths at once)
+so that it's cheap enough to run inside parameter sweeps
+"""
+
+# the std_orings table as arrays, in table order
+sizes = np.array(list(c.std_orings))
+ids = np.array([ring["id"] for ring in c.std_orings.values()], dtype=float)
+css = np.array([ring["cs"] for ring in c.std_orings.values()], dtype=float)
+id_tols = np.array([ring["id_tol"] for ring in c.std_orings.values()], dtype=float)
+cs_tols = np.array([ring["cs_tol"] for ring in c.std_orings.values()], dtype=float)
+
+# rings without groove data get their gland from the oring_grooves fractions
+gland_depths = np.array([ring["gland_depth"] for ring in c.std_orings.values()], dtype=float)
+gland_depths = np.where(gland_depths > 0, gland_depths, c.oring_grooves["groove_h_fraction"] * css)
+groove_ws = np.array([ring["groove_w"] for ring in c.std_orings.values()], dtype=float)
+groove_ws = np.where(groove_ws > 0, groove_ws, c.oring_grooves["groove_w_fraction"] * css)
+
+# nominal squeeze fraction of each ring in its gland
+squeezes = (css - gland_depths) / css
+
+
+def evaluate(perimeter, min_bend_r=np.inf, available_width=np.inf) -> dict[str, np.ndarray]:
+    """
+    check every ring in the table against one or more gland paths
+    perimeter, min_bend_r and available_width are the length, tightest centerline bend radius
+    and the room for the groove's width of the paths, scalars or arrays of shape (M,)
+    returns arrays of shape (M, N) for the N rings: "stretch" (the nominal fractional stretch of the ring
+    around the path's centerline) and "feasible" (if the ring passes all the design rules)
+    """
+    perimeter = np.atleast_1d(np.asarray(perimeter, dtype=float))[:, None]
+    min_bend_r = np.atleast_1d(np.asarray(min_bend_r, dtype=float))[:, None]
+    available_width = np.atleast_1d(np.asarray(available_width, dtype=float))[:, None]
+
+    stretch = perimeter / (np.pi * (ids + css)) - 1
+    worst_stretch = perimeter / (np.pi * (ids - id_tols + css)) - 1  # smallest ring in tolerance
+    least_squeeze = css - cs_tols - gland_depths  # thinnest ring in tolerance, in mm
+
+    feasible = (stretch >= -1e-9) & (worst_stretch <= c.oring_grooves["max_stretch_fraction"])
+    feasible &= (squeezes <= c.oring_grooves["squeeze_fraction"] + 1e-9) & (least_squeeze >= c.oring_grooves["min_squeeze"])
+    feasible &= min_bend_r - css / 2 >= c.oring_grooves["corner_r_fraction"] * css
+    feasible &= groove_ws <= available_width
+    return {"stretch": stretch, "feasible": feasible}
+
+
+def select_orings(perimeter: float, min_bend_r: float = np.inf, available_width: float = np.inf) -> list[dict]:
+    """
+    the rings that fit a gland path (see evaluate()), best first:
+    least stretch, then most squeeze
+    """
+    result = evaluate(perimeter, min_bend_r, available_width)
+    stretch, feasible = result["stretch"][0], result["feasible"][0]
+    candidates = np.flatnonzero(feasible)
+    ranked = candidates[np.lexsort((-squeezes[candidates], stretch[candidates]))]
+    return [
+        {
+            "size": sizes[i].item(),
+            "id": ids[i].item(),
+            "cs": css[i].item(),
+            "stretch": stretch[i].item(),
+            "squeeze": squeezes[i].item(),
+            "gland_depth": gland_depths[i].item(),
+            "groove_w": groove_ws[i].item(),
+        }
+        for i in ranked
+    ]
@@ -1,10 +1,15 @@
 import math
+import uuid
+import collections
+import concurrent.futures
 from re import S
 from cadquery import cq, CQ
 import cadquery
 from . import utilities as u
 from . import constants as c
 from . import groovy
+from . import fasteners
+from .cq_serialize import register as register_cq_helper
 import logging
 from cq_warehouse.fastener import CounterSunkScrew, PanHeadScrew
 import cq_warehouse.extensions  # this does something even though it's not directly used
@@ -26,6 +31,91 @@ logger.addHandler(ch)
 # length of the connector passthrough geometry on the bottom surface
 surface_length: float = None  # type: ignore[assignment]
 
+# make_cut() pocket negatives we've already made in this process (in the connector's local coordinates, before mirroring)
+# (most recently used last, at most negative_cache_size of them)
+# keyed by (rows, kind, mfg, thickness rounded to 1 nm, angle)
+negative_cache: collections.OrderedDict[tuple, cq.Solid] = collections.OrderedDict()
+negative_cache_size = 256
+
+
+def _fix_screw(screw: str, length: float):
+    """the screws that hold a passthrough to the wall"""
+    return fasteners.get_fastener(CounterSunkScrew, screw, "iso14581", length=length)
+
+
+def _pcb_screw(screw: str, length: float):
+    """the screws that hold the pcb to a passthrough's support towers"""
+    return fasteners.get_fastener(PanHeadScrew, screw, "iso14583", length=length)
+
+
+# make_oringer()'s sub-part builders live out here so that they can be sent to worker processes
+
+
+def _make_oringer_pcb(screw, pcb_scr_len, wall_depth, board_width, board_inner_depth, board_outer_depth, pcbt, pcb_corner, block_width, pt_pcb_mount_hole_offset, p0pts, pin0_holed) -> tuple[cq.Solid, cadquery.Assembly]:
+    """build the actual passthrough PCB (in local coordinates) and its hardware"""
+    pcb_scr = _pcb_screw(screw, pcb_scr_len)
+    pcb = CQ().workplane(offset=-wall_depth - board_inner_depth)
+    pcb = pcb.rect(board_width, pcbt).extrude(until=board_inner_depth + wall_depth + board_outer_depth)
+
+    pcb = pcb.edges("|Y").fillet(pcb_corner)
+
+    # put in screws with holes
+    hardware = cadquery.Assembly()
+    pcb = pcb.faces(">Y").workplane(**u.cobb).rarray(board_width - 2 * block_width / 2, board_inner_depth + board_outer_depth + wall_depth - 2 * pt_pcb_mount_hole_offset[0], 2, 2).clearanceHole(pcb_scr, fit="Close", counterSunk=False, baseAssembly=hardware)
+
+    # put in pin0 holes
+    pcb = pcb.faces(">Y").workplane(**u.copo, origin=(0, 0, 0)).pushPoints(p0pts).circle(pin0_holed / 2).cutThruAll()
+
+    return pcb.findSolid(), hardware
+
+
+def _make_oringer_pt(screw, pt_fix_scr_len, pcb_scr_len, passthrough_face, o_face, fhps, sbpts, support_block, part_thickness, wall_depth, board_width, board_inner_depth, board_outer_depth, pcbt, pcb_corner, pt_pcb_mount_hole_offset, min_gap, oring_cs) -> tuple[cq.Solid, cadquery.Assembly]:
+    """build a passthrough component (in local coordinates) and its hardware"""
+    fix_scr = _fix_screw(screw, pt_fix_scr_len)
+    pcb_scr = _pcb_screw(screw, pcb_scr_len)
+    hardware = cadquery.Assembly()
+    passthrough = CQ().add(passthrough_face)
+    passthrough = passthrough.wires().toPending().extrude(-part_thickness)  # extrude the bulk
+    slotd = pcbt + 2 * min_gap
+    passthrough = passthrough.workplane(centerOption="ProjectedOrigin").slot2D(length=board_width + slotd / 2, diameter=slotd, angle=0).cutThruAll()  # cut the pcb slot
+    # TODO: retool some geometry because this cutout could possibly interfere with the oring gland for thick PCBs
+
+    # cut the oring groove
+    oring_path = o_face.outerWire().translate((0, 0, -part_thickness))
+    passthrough = groovy.mk_groove(passthrough.faces("<<Z").workplane(**u.copo).add(oring_path).toPending(), ring_cs=oring_cs, hardware=hardware)
+
+    # cut the fastening screw holes
+    passthrough = passthrough.faces(">Z").workplane(**u.copo, origin=(0, 0, 0)).pushPoints(fhps).clearanceHole(fix_scr, fit="Close", baseAssembly=hardware)
+
+    # add the support towers
+    in_post_length = wall_depth + board_inner_depth
+    passthrough = passthrough.faces(">Z").workplane(**u.copo, origin=(0, 0, 0)).sketch().push(sbpts).rect(*support_block).finalize().extrude(-in_post_length)
+    passthrough = passthrough.faces(">Z").workplane(**u.copo, origin=(0, 0, 0)).sketch().push(sbpts).rect(*support_block).finalize().extrude(board_outer_depth)
+    # mount holes
+    pcb_center_z = ((board_outer_depth) - (wall_depth + board_inner_depth)) / 2
+    passthrough = passthrough.faces("+Y").faces(">>Z").workplane(**u.copo, origin=(0, 0, pcb_center_z)).rarray(board_width - 2 * pt_pcb_mount_hole_offset[1], board_inner_depth + board_outer_depth + wall_depth - 2 * pt_pcb_mount_hole_offset[0], 2, 2).clearanceHole(pcb_scr, fit="Close", counterSunk=False)
+    passthrough = passthrough.edges("<<Z or >>Z").edges("|Y").fillet(pcb_corner)
+    passthrough = passthrough.edges("<<Z[-1] or <<Z[-2] or <<Z[-3] or >>Z[-1] or >>Z[-2] or >>Z[-3]").chamfer(0.5)
+
+    return passthrough.findSolid(), hardware
+
+
+def _make_oringer_neg(through_face, recess_face, fhps, tap_hole_d, tap_depth, wall_depth, part_thickness) -> cq.Solid:
+    """makes a negative shape (in local coordinates) to be cut out of the parent walls"""
+    # fastener threaded holes
+    # TODO: mark these holes as "M3-0.5 threaded" in the engineering drawing
+    fhs = CQ().pushPoints(fhps).circle(tap_hole_d / 2).extrude(-tap_depth)
+
+    nwp = CQ().add(through_face)
+    through = nwp.wires().toPending().extrude(-wall_depth)
+
+    nwp2 = CQ().add(recess_face)
+    recess = nwp2.wires().toPending().extrude(-part_thickness)
+
+    neg = recess.union(through).union(fhs)
+
+    return neg.findSolid()
+
 
 def make_oringer(
     self: cq.Workplane,
@@ -38,7 +128,13 @@ def make_oringer(
     pt_asy: cadquery.Assembly = None,
     pcb_asy: cadquery.Assembly = None,
     hw_asy: cadquery.Assembly = None,
+    nparallel: int = 1,
 ) -> cq.Workplane:
+    """
+    cuts pcb passthroughs through the walls at every point on the stack
+    the passthrough parts, pcbs and their hardware go into pt_asy, pcb_asy and hw_asy (when given)
+    with nparallel > 1, the wall negative, passthrough and pcb are built in that many worker processes
+    """
     logger = logging.getLogger(__name__)
     if wall_depth == 0:  # if depth is not given do our best to find it
         wall_depth = u.find_length(self, along="normal", bb_method=False)
@@ -73,8 +169,7 @@ def make_oringer(
     pcb_scr_len = 12  # SHP-M3-12-V2-A2, round(block_height_nominal + pcbt + 4)
     pt_fix_scr_len = 10  # SHK-M3-10-V2-A2, round(wall_depth * 0.8)
     pt_fix_wall_buffer = 1  # amount of wall to leave behind the threaded screw hole
-    fix_scr = CounterSunkScrew(size=screw, fastener_type="iso14581", length=pt_fix_scr_len)
-    pcb_scr = PanHeadScrew(size=screw, fastener_type="iso14583", length=pcb_scr_len)
+    fix_scr = _fix_screw(screw, pt_fix_scr_len)
     # washer = CheeseHeadWasher(size=screw, fastener_type="iso7092")
     # nylock nut = HNN-M3-A2
 
@@ -265,116 +360,55 @@ def make_oringer(
     fhps.append((bcx, pcbt / 2 + ffo - co_tw - min_wall - gland_width - min_wall - fix_scr.clearance_hole_diameters["Close"] / 2))
     fhps.append((-bcx, pcbt / 2 + ffo - co_tw - min_wall - gland_width - min_wall - fix_scr.clearance_hole_diameters["Close"] / 2))
 
-    def _make_pcb(what):
-        """build the actual passthrough PCB"""
-        # this copies some logic in the eachpoint() function so that we can use each() which is safer
-        base_plane = self.plane
-        base = base_plane.location
-        if isinstance(what, (cq.Vector, cq.Shape)):
-            loc = base.inverse * cq.Location(base_plane, what.Center())
-        elif isinstance(what, cq.Sketch):
-            loc = base.inverse * cq.Location(base_plane, what._faces.Center())
-        else:
-            loc = what
-
-        pcb = CQ().workplane(offset=-wall_depth - board_inner_depth)
-        pcb = pcb.rect(board_width, pcbt).extrude(until=board_inner_depth + wall_depth + board_outer_depth)
-
-        pcb = pcb.edges("|Y").fillet(pcb_corner)
-
-        # put in screws with holes
-        hardware = cadquery.Assembly()
-        pcb = pcb.faces(">Y").workplane(**u.cobb).rarray(board_width - 2 * block_width / 2, board_inner_depth + board_outer_depth + wall_depth - 2 * pt_pcb_mount_hole_offset[0], 2, 2).clearanceHole(pcb_scr, fit="Close", counterSunk=False, baseAssembly=hardware)
-        if hw_asy is not None:
-            hw_asy.add(hardware, loc=base * loc)
-
-        # put in pin0 holes
-        pcb = pcb.faces(">Y").workplane(**u.copo, origin=(0, 0, 0)).pushPoints(p0pts).circle(pin0_holed / 2).cutThruAll()
-
-        return pcb.findSolid().moved(base * loc)
-
-    def _make_pt(what):
-        """build a passthrough component"""
-        # this copies some logic in the eachpoint() function so that we can use each() which is safer
-        base_plane = self.plane
-        base = base_plane.location
-        if isinstance(what, (cq.Vector, cq.Shape)):
-            loc = base.inverse * cq.Location(base_plane, what.Center())
-        elif isinstance(what, cq.Sketch):
-            loc = base.inverse * cq.Location(base_plane, what._faces.Center())
-        else:
-            loc = what
-
-        hardware = cadquery.Assembly()
-        passthrough = CQ().add(passthrough_face)
-        passthrough = passthrough.wires().toPending().extrude(-part_thickness)  # extrude the bulk
-        slotd = pcbt + 2 * min_gap
-        passthrough = passthrough.workplane(centerOption="ProjectedOrigin").slot2D(length=board_width + slotd / 2, diameter=slotd, angle=0).cutThruAll()  # cut the pcb slot
-        # TODO: retool some geometry because this cutout could possibly interfere with the oring gland for thick PCBs
-
-        # cut the oring groove
-        cq.Workplane.mk_groove = groovy.mk_groove
-        oring_path = o_face.outerWire().translate((0, 0, -part_thickness))
-        passthrough = passthrough.faces("<<Z").workplane(**u.copo).add(oring_path).toPending().mk_groove(ring_cs=oring_cs, hardware=hardware)
-
-        # cut the fastening screw holes
-        passthrough = passthrough.faces(">Z").workplane(**u.copo, origin=(0, 0, 0)).pushPoints(fhps).clearanceHole(fix_scr, fit="Close", baseAssembly=hardware)
-
-        # add the support towers
-        in_post_length = wall_depth + board_inner_depth
-        passthrough = passthrough.faces(">Z").workplane(**u.copo, origin=(0, 0, 0)).sketch().push(sbpts).rect(*support_block).finalize().extrude(-in_post_length)
-        passthrough = passthrough.faces(">Z").workplane(**u.copo, origin=(0, 0, 0)).sketch().push(sbpts).rect(*support_block).finalize().extrude(board_outer_depth)
-        # mount holes
-        pcb_center_z = ((board_outer_depth) - (wall_depth + board_inner_depth)) / 2
-        passthrough = passthrough.faces("+Y").faces(">>Z").workplane(**u.copo, origin=(0, 0, pcb_center_z)).rarray(board_width - 2 * pt_pcb_mount_hole_offset[1], board_inner_depth + board_outer_depth + wall_depth - 2 * pt_pcb_mount_hole_offset[0], 2, 2).clearanceHole(pcb_scr, fit="Close", counterSunk=False)
-        passthrough = passthrough.edges("<<Z or >>Z").edges("|Y").fillet(pcb_corner)
-        passthrough = passthrough.edges("<<Z[-1] or <<Z[-2] or <<Z[-3] or >>Z[-1] or >>Z[-2] or >>Z[-3]").chamfer(0.5)
-
-        if hw_asy is not None:
-            hw_asy.add(hardware, loc=base * loc)
-
-        return passthrough.findSolid().moved(base * loc)
-
-    def _make_neg(what):
-        """makes a negative shape to be cut out of the parent walls"""
-        # this copies some logic in the eachpoint() function so that we can use each() which is safer
-        base_plane = self.plane
-        base = base_plane.location
+    # where each passthrough goes
+    # this copies some logic in the eachpoint() function so that we can work like each() which is safer
+    base_plane = self.plane
+    base = base_plane.location
+    locs = []
+    for what in self.objects:
         if isinstance(what, (cq.Vector, cq.Shape)):
             loc = base.inverse * cq.Location(base_plane, what.Center())
         elif isinstance(what, cq.Sketch):
             loc = base.inverse * cq.Location(base_plane, what._faces.Center())
         else:
             loc = what
+        locs.append(base * loc)
 
-        # fastener threaded holes
-        # TODO: mark these holes as "M3-0.5 threaded" in the engineering drawing
-        fhs = CQ().pushPoints(fhps).circle(fix_scr.tap_hole_diameters["Soft"] / 2).extrude(-wall_depth + pt_fix_wall_buffer)
-
-        nwp = CQ().add(through_face)
-        through = nwp.wires().toPending().extrude(-wall_depth)
-
-        nwp2 = CQ().add(recess_face)
-        recess = nwp2.wires().toPending().extrude(-part_thickness)
-
-        neg = recess.union(through).union(fhs)
+    # every passthrough is identical, so each part is built once and then placed at all the locations
+    builders = {}
+    builders["neg"] = (_make_oringer_neg, dict(through_face=through_face, recess_face=recess_face, fhps=fhps, tap_hole_d=fix_scr.tap_hole_diameters["Soft"], tap_depth=wall_depth - pt_fix_wall_buffer, wall_depth=wall_depth, part_thickness=part_thickness))
+    if pt_asy is not None:
+        builders["pt"] = (_make_oringer_pt, dict(screw=screw, pt_fix_scr_len=pt_fix_scr_len, pcb_scr_len=pcb_scr_len, passthrough_face=passthrough_face, o_face=o_face, fhps=fhps, sbpts=sbpts, support_block=support_block, part_thickness=part_thickness, wall_depth=wall_depth, board_width=board_width, board_inner_depth=board_inner_depth, board_outer_depth=board_outer_depth, pcbt=pcbt, pcb_corner=pcb_corner, pt_pcb_mount_hole_offset=pt_pcb_mount_hole_offset, min_gap=min_gap, oring_cs=oring_cs))
+    if pcb_asy is not None:
+        builders["pcb"] = (_make_oringer_pcb, dict(screw=screw, pcb_scr_len=pcb_scr_len, wall_depth=wall_depth, board_width=board_width, board_inner_depth=board_inner_depth, board_outer_depth=board_outer_depth, pcbt=pcbt, pcb_corner=pcb_corner, block_width=block_width, pt_pcb_mount_hole_offset=pt_pcb_mount_hole_offset, p0pts=p0pts, pin0_holed=pin0_holed))
 
-        return neg.findSolid().moved(base * loc)
+    if (nparallel > 1) and (len(builders) > 1):
+        register_cq_helper()  # register picklers
+        with concurrent.futures.ProcessPoolExecutor(max_workers=nparallel, initializer=register_cq_helper) as executor:
+            futures = {part: executor.submit(builder, **kwargs) for part, (builder, kwargs) in builders.items()}
+            parts = {part: future.result() for part, future in futures.items()}
+    else:
+        parts = {part: builder(**kwargs) for part, (builder, kwargs) in builders.items()}
 
-    rslt = self.each(_make_neg, useLocalCoordinates=False, combine="cut", clean=True)
+    rslt = self._combineWithBase([parts["neg"].moved(loc) for loc in locs], "cut", clean=True)  # one cut for all of them
 
     # pass out the passthrough geometry
     if pt_asy is not None:
-        passthroughs = self.each(_make_pt, useLocalCoordinates=False, combine=False).vals()
-        for i, passthrough in enumerate(passthroughs):
-            pt_asy.add(passthrough.Solids()[0], name=f"passthrough {i}")
+        passthrough, hardware = parts["pt"]
+        passthrough = passthrough.Solids()[0]  # findSolid() can give a compound, the assembly gets just the part
+        for i, loc in enumerate(locs):
+            pt_asy.add(passthrough.moved(loc), name=f"passthrough {i}")
+            if hw_asy is not None:
+                hw_asy.add(hardware, loc=loc, name=str(uuid.uuid1()))
 
     # pass out the pcb geometry
     if pcb_asy is not None:
-        # pcbs = self.eachpoint(lambda loc: _make_pcb().moved(loc), useLocalCoordinates=True, combine=False).vals()
-        pcbs = self.each(_make_pcb, useLocalCoordinates=False, combine=False).vals()
-        for i, pcb in enumerate(pcbs):
-            pcb_asy.add(pcb.Solids()[0], name=f"pcb {i}")
+        pcb, hardware = parts["pcb"]
+        pcb = pcb.Solids()[0]
+        for i, loc in enumerate(locs):
+            pcb_asy.add(pcb.moved(loc), name=f"pcb {i}")
+            if hw_asy is not None:
+                hw_asy.add(hardware, loc=loc, name=str(uuid.uuid1()))
 
     return rslt
 
@@ -405,59 +439,71 @@ def make_cut(self, rows=8, angle=0, kind="C", mfg="samtec"):
 
     surface_length = con_len + 2 * chamfer_length
 
+    # the connector pocket's dimensions
+    pocket_w = connector_width + con_clearance * 2
+    pocket_l = con_len + con_clearance * 2
+    pocket_d = connector_height + con_clearance
+
     test_hole_length = self.largestDimension()
 
-    def _makeNegative(center):
+    # find the source thing's thickness at all the cut points in one go, with rays along the workplane normal
+    # (in the order eachpoint() visits them, so position i on the stack gets thicknesses[i])
+    cut_points = [v.toTuple() for v in self.eachpoint(lambda loc: cq.Vertex.makeVertex(0, 0, 0).moved(loc), useLocalCoordinates=True, combine=False).vals()]
+    thicknesses = u.ThicknessProbe(self.findSolid()).thickness(cut_points, self.plane.zDir.toTuple())
+    if any(thicknesses == 0):  # points off the part get the whole part's thickness, like they always did
+        thicknesses[thicknesses == 0] = u.find_length(self, along="normal", bb_method=False)
+
+    def _makeNegative(center, this_thikness):
         """
         Generates the pocket shape we'll be cutting out
         """
 
-        # the connector pocket's dimensions
-        pocket_w = connector_width + con_clearance * 2
-        pocket_l = con_len + con_clearance * 2
-        pocket_d = connector_height + con_clearance
-
-        # find the source thing's thickness at the cut point
-        swiss = CQ(self.plane).add(self.findSolid())
-        cheese = CQ(self.plane).add(self.findSolid()).pushPoints([center]).circle(0.5).cutThruAll()
-        core = swiss.cut(cheese)
-        this_thikness = u.find_length(core, along="normal", bb_method=False)
-
         min_thickness = pocket_d + min_gp_connector_pocket_spacing + gp_depth
 
         # check that it's thick enough here
         if this_thikness < min_thickness:
             raise (ValueError(f"The part is too thin (thickness = {this_thikness}) at {center} to cut the PCB pocket"))
 
-        # make a box to subtract from
-        start_box = CQ("XY").box(100, 100, this_thikness, centered=(True, True, False))
+        key = (rows, kind, mfg, round(this_thikness, 6), angle)
+        if key in negative_cache:
+            negative_cache.move_to_end(key)
+        else:
+            # make a box to subtract from
+            start_box = CQ("XY").box(100, 100, this_thikness, centered=(True, True, False))
+
+            # make a simple pocket that we'll use for the chamfer operation
+            result = start_box.faces("<Z").rect(pocket_w, pocket_l).cutBlind(pocket_d)
 
-        # make a simple pocket that we'll use for the chamfer operation
-        result = start_box.faces("<Z").rect(pocket_w, pocket_l).cutBlind(pocket_d)
+            # chamfer the connector edge
+            result = result.faces("<Z").edges("not(<X or >X or <Y or >Y)").chamfer(chamfer_length)
 
-        # chamfer the connector edge
-        result = result.faces("<Z").edges("not(<X or >X or <Y or >Y)").chamfer(chamfer_length)
+            # now make the undercut pocket
+            CQ.undercutRelief2D = u.undercutRelief2D
+            result = result.faces("<Z").workplane().undercutRelief2D(pocket_l, pocket_w, diameter=r * 2, angle=90, kind=kind).cutBlind(pocket_d)
 
-        # now make the undercut pocket
-        CQ.undercutRelief2D = u.undercutRelief2D
-        result = result.faces("<Z").workplane().undercutRelief2D(pocket_l, pocket_w, diameter=r * 2, angle=90, kind=kind).cutBlind(pocket_d)
+            # cut out the glue pocket
+            slot_width = c.pcb_thickness + 2 * gp_buffer
+            slot_len = pcb_len + slot_width
+            result = result.faces(">Z").workplane().slot2D(slot_len, slot_width, angle=90).cutBlind(-gp_depth)
 
-        # cut out the glue pocket
-        slot_width = c.pcb_thickness + 2 * gp_buffer
-        slot_len = pcb_len + slot_width
-        result = result.faces(">Z").workplane().slot2D(slot_len, slot_width, angle=90).cutBlind(-gp_depth)
+            # cut out the pcb passthrough slot
+            slot_width = c.pcb_thickness + 2 * pcb_clearance
+            slot_len = pcb_len + slot_width
+            result = result.faces(">Z").workplane().slot2D(slot_len, slot_width, angle=90).cutThruAll()
 
-        # cut out the pcb passthrough slot
-        slot_width = c.pcb_thickness + 2 * pcb_clearance
-        slot_len = pcb_len + slot_width
-        result = result.faces(">Z").workplane().slot2D(slot_len, slot_width, angle=90).cutThruAll()
+            # invert the geometry and rotate the negative
+            negative = start_box.cut(result)
+            negative = negative.rotate((0, 0, 0), (0, 0, 1), angle)
+            negative_cache[key] = negative.findSolid()
+            if len(negative_cache) > negative_cache_size:
+                negative_cache.popitem(last=False)
 
-        # invert the geometry and rotate the negative
-        negative = start_box.cut(result)
-        negative = negative.rotate((0, 0, 0), (0, 0, 1), angle)
-        to_cut = negative.findSolid().locate(center)
+        to_cut = negative_cache[key].located(center)
         to_cut = to_cut.mirror("XY")
         return to_cut
 
-    rslt = self.cutEach(_makeNegative, useLocalCoords=True, clean=True)
+    # identical connectors share one negative, and they all get cut out in one go
+    thickness_of = iter(thicknesses)
+    negatives = self.eachpoint(lambda center: _makeNegative(center, next(thickness_of)), useLocalCoordinates=True, combine=False).vals()
+    rslt = self._combineWithBase(negatives, "cut", clean=True)
     return rslt
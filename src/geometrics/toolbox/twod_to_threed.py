@@ -7,6 +7,7 @@ import ezdxf.filemanagement
 from ezdxf.addons.drawing import matplotlib
 import concurrent.futures
 from geometrics.toolbox.cq_serialize import register as register_cq_helper
+from geometrics.toolbox import components
 import math
 import shutil
 import subprocess
@@ -397,6 +398,9 @@ class TwoDToThreeD(object):
     ):
         """do output tasks on a dictionary of assemblies"""
         for stack_name, result in built.items():
+            if (not show_object) and components.proxies:  # final outputs get the real components
+                components.swap_proxies(result["assembly"])
+
             if ("instructions" in result) and ("sim_mode" in result["instructions"]):
                 simulation_outputs = result["instructions"]["sim_mode"]
             else:
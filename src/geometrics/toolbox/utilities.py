@@ -1,7 +1,21 @@
+import os
 import sys
 import logging
+import hashlib
+import functools
+import collections
 import pathlib  # noqa: F401
+import concurrent.futures
+import numpy as np
 import cadquery as cq  # type: ignore[import]
+from OCP.gp import gp_Pnt, gp_Dir, gp_Lin, gp_Trsf
+from OCP.IntCurvesFace import IntCurvesFace_ShapeIntersector
+from OCP.Bnd import Bnd_OBB
+from OCP.BRepAlgoAPI import BRepAlgoAPI_Cut
+from OCP.ShapeUpgrade import ShapeUpgrade_UnifySameDomain
+from OCP.TopTools import TopTools_ListOfShape
+from OCP.BRepBndLib import BRepBndLib
+from .cq_serialize import register as register_cq_helper
 
 # setup logging
 logger = logging.getLogger(__name__)
@@ -18,6 +32,130 @@ tld: pathlib.Path = None  # type: ignore[assignment] # noqa: F821
 copo = {"centerOption": "ProjectedOrigin"}
 cobb = {"centerOption": "CenterOfBoundBox"}
 
+# where things that are expensive to compute get stored between runs
+# can be overridden with the GEOMETRICS_CACHE_DIR environment variable
+cache_dir: pathlib.Path = pathlib.Path(os.environ.get("GEOMETRICS_CACHE_DIR", pathlib.Path(os.environ.get("XDG_CACHE_HOME", pathlib.Path.home() / ".cache")) / "geometrics"))
+
+# set to "obb", "hull" or "revolve" to have import_step give simplified stand-ins for components
+# (for faster interactive builds), they get swapped back for the real thing in TwoDToThreeD.outputter
+proxy_mode: str | None = None
+
+# shapes from STEP files we've already imported in this process
+# keyed by (resolved path, mtime in ns, size in bytes)
+step_cache: dict[tuple[str, int, int], list[cq.Shape]] = {}
+
+# vertex coordinates of shapes we've measured in this process, as (N, 3) arrays (most recently used last, at most vertex_cache_size of them)
+# keyed by the shape itself (so a moved copy is a different key)
+vertex_cache: collections.OrderedDict[cq.Shape, np.ndarray] = collections.OrderedDict()
+vertex_cache_size = 1024
+
+
+# undercutRelief2D() outlines (centered on the origin) that we've already made in this process
+# keyed by (length, width, diameter, kind, corner_tol, angle)
+relief_cache: dict[tuple, cq.Wire] = {}
+
+# what selector strings picked out in this process (most recently used last, at most selection_cache_size of them)
+# keyed by (the shapes on the stack, object type, selector string), so changing the solid means a new key
+selection_cache: collections.OrderedDict[tuple, list] = collections.OrderedDict()
+selection_cache_size = 1024
+
+
+def _relief_corner(length: float, width: float, diameter: float, kind: str, corner_tol: float) -> list[tuple] | None:
+    """
+    the relief outline around the rectangle's (0, 0) corner, for a rectangle in +X, +Y
+    as segments running from the corner's x=0 side to its y=0 side: (start, end) for lines, (start, mid, end) for arcs
+    None if it's not that simple (the corner reliefs reach past the middle of the rectangle and so might overlap)
+    """
+    r = diameter / 2
+    t = corner_tol
+    if t < 0:
+        return None
+    if kind == "A":
+        if (r - t > length / 2) or (diameter > width / 2):
+            return None
+        segments = []
+        if t > 0:
+            segments.append(((0, diameter), (-t, diameter)))
+        segments.append(((-t, diameter), (-t - r, r), (-t, 0)))
+    elif kind == "B":
+        # A with x and y swapped
+        segments = _relief_corner(width, length, diameter, "A", corner_tol)
+        if segments is None:
+            return None
+        segments = [tuple((y, x) for (x, y) in reversed(segment)) for segment in reversed(segments)]
+    else:  # "C"
+        a = (r - t) / 2 ** (1 / 2)  # the circle's center is at (a, a)
+        if (a + r > length / 2) or (a + r > width / 2) or (a <= -r / 2 ** (1 / 2)):
+            return None
+        reach = a + (r**2 - a**2) ** (1 / 2)  # where the circle crosses the rectangle's sides
+        segments = [((0, reach), (a - r / 2 ** (1 / 2), a - r / 2 ** (1 / 2)), (reach, 0))]
+    return segments
+
+
+def _relief_outline(length: float, width: float, diameter: float, kind: str, corner_tol: float) -> cq.Wire | None:
+    """the whole relief outline as lines and arcs, going counterclockwise around the rectangle from (0, 0) to (length, width)"""
+    corner = _relief_corner(length, width, diameter, kind, corner_tol)
+    if corner is None:
+        return None
+
+    segments: list[tuple] = []
+    for sx, sy in ((1, 1), (-1, 1), (-1, -1), (1, -1)):  # the corners in counterclockwise order
+        # every corner is a mirror image of the (0, 0) one, mirroring once reverses the direction of travel
+        placed = [tuple((x if sx > 0 else length - x, y if sy > 0 else width - y) for (x, y) in segment) for segment in corner]
+        if sx * sy < 0:
+            placed = [tuple(reversed(segment)) for segment in reversed(placed)]
+        if segments:
+            segments.append((segments[-1][-1], placed[0][0]))  # along the side of the rectangle
+        segments.extend(placed)
+    segments.append((segments[-1][-1], segments[0][0]))
+
+    edges = []
+    for segment in segments:
+        points = [cq.Vector(x - length / 2, y - width / 2, 0) for (x, y) in segment]
+        if len(points) == 3:
+            edges.append(cq.Edge.makeThreePointArc(*points))
+        elif (points[1] - points[0]).Length > 1e-9:
+            edges.append(cq.Edge.makeLine(*points))
+    return cq.Wire.assembleEdges(edges)
+
+
+def _relief_solid_outline(length: float, width: float, diameter: float, kind: str, corner_tol: float) -> cq.Wire:
+    """the whole relief outline, from unioning solids, for when _relief_outline() can't do it"""
+    r = diameter / 2
+    sqrt2 = 2 ** (1 / 2)
+
+    if kind == "A":
+        corner_shift = cq.Vector((-corner_tol, r, 0))
+        if corner_tol > 0:
+            b1 = cq.Solid.makeBox(corner_tol, diameter, 1, pnt=(corner_shift + cq.Vector((0, -r, 0))))
+    elif kind == "B":
+        corner_shift = cq.Vector((r, -corner_tol, 0))
+        if corner_tol > 0:
+            b1 = cq.Solid.makeBox(diameter, corner_tol, 1, pnt=(corner_shift + cq.Vector((-r, 0, 0))))
+    else:  # "C"
+        along_edge = diameter / sqrt2
+        corner_shift = cq.Vector((along_edge / 2 - corner_tol / sqrt2, along_edge / 2 - corner_tol / sqrt2, 0))
+
+    m1_point = cq.Vector((0, width / 2, 0))
+    m2_point = cq.Vector((length / 2, 0, 0))
+
+    c1 = cq.Solid.makeCylinder(r, 1, pnt=corner_shift)
+    # handle extra length needed for tolerance
+    if (corner_tol > 0) and ((kind == "A") or (kind == "B")):
+        c1 = c1.fuse(b1).clean()
+    c2 = c1.mirror("ZX", m1_point)
+    c3 = c2.mirror("YZ", m2_point)
+    c4 = c1.mirror("YZ", m2_point)
+    b = cq.Solid.makeBox(length, width, 1)
+
+    wp = cq.Workplane("XY")
+
+    shape = wp.union(b).union(c1).union(c2).union(c3).union(c4)
+    shape = shape.translate((-length / 2, -width / 2))
+
+    face = shape.faces("<Z").faces().val()
+    return face.outerWire()
+
 
 def undercutRelief2D(self: cq.Workplane, length: float, width: float, diameter: float, angle: float = 0, kind: str = "C", corner_tol: float = 0) -> cq.Workplane:
     """
@@ -36,71 +174,286 @@ def undercutRelief2D(self: cq.Workplane, length: float, width: float, diameter:
 
     result = cq.Workplane("XY").box(10,25,3).rarray(1,5,1,5).undercutRelief2D(5,3,1).cutBlind(2)
 
+    The outline is drawn once (from lines and arcs) for each set of parameters and then placed at every point.
     """
+    error_string = "undercutRelief2D could not be drawn " "because the relief arcs collide with eachother"
+
+    if kind == "A":
+        if width <= diameter:
+            raise (ValueError(error_string))
+    elif kind == "B":
+        if length <= diameter:
+            raise (ValueError(error_string))
+    elif kind == "C":
+        along_edge = diameter / 2 ** (1 / 2)
+        if width <= along_edge or length <= along_edge:
+            raise (ValueError(error_string))
+    else:
+        raise (ValueError('kind must be either "A" "B" or "C"'))
+
+    key = (length, width, diameter, kind, corner_tol, angle)
+    if key not in relief_cache:
+        slot = _relief_outline(length, width, diameter, kind, corner_tol)
+        if slot is None:
+            slot = _relief_solid_outline(length, width, diameter, kind, corner_tol)
+        relief_cache[key] = slot.rotate((0, 0, 0), (0, 0, 1), angle)
 
     def _makeundercut(pnt):
         """
-        Inner function that is used to create a relief undercut shape for each point/object on the workplane
+        Inner function that is used to place the relief undercut shape at each point/object on the workplane
         :param pnt: The center point for the slot
-        :return: A CQ object representing a relief undercut shape
+        :return: A wire representing a relief undercut shape
         """
-        error_string = "undercutRelief2D could not be drawn " "because the relief arcs collide with eachother"
-
-        r = diameter / 2
-        sqrt2 = 2 ** (1 / 2)
-
-        if kind == "A":
-            along_edge = diameter
-            if width <= along_edge:
-                raise (ValueError(error_string))
-            corner_shift = cq.Vector((-corner_tol, r, 0))
-            if corner_tol > 0:
-                b1 = cq.Solid.makeBox(corner_tol, diameter, 1, pnt=(corner_shift + cq.Vector((0, -r, 0))))
-        elif kind == "B":
-            along_edge = diameter
-            if length <= along_edge:
-                raise (ValueError(error_string))
-            corner_shift = cq.Vector((r, -corner_tol, 0))
-            if corner_tol > 0:
-                b1 = cq.Solid.makeBox(diameter, corner_tol, 1, pnt=(corner_shift + cq.Vector((-r, 0, 0))))
-        elif kind == "C":
-            along_edge = diameter / sqrt2
-            if width <= along_edge or length <= along_edge:
-                raise (ValueError(error_string))
-            corner_shift = cq.Vector((along_edge / 2 - corner_tol / sqrt2, along_edge / 2 - corner_tol / sqrt2, 0))
-        else:
-            raise (ValueError('kind must be either "A" "B" or "C"'))
+        return relief_cache[key].located(pnt)
+
+    return self.eachpoint(_makeundercut, True)
 
-        m1_point = cq.Vector((0, width / 2, 0))
-        m2_point = cq.Vector((length / 2, 0, 0))
 
-        c1 = cq.Solid.makeCylinder(r, 1, pnt=corner_shift)
-        # handle extra length needed for tolerance
-        if (corner_tol > 0) and ((kind == "A") or (kind == "B")):
-            c1 = c1.fuse(b1).clean()
-        c2 = c1.mirror("ZX", m1_point)
-        c3 = c2.mirror("YZ", m2_point)
-        c4 = c1.mirror("YZ", m2_point)
-        b = cq.Solid.makeBox(length, width, 1)
+class DeferredWorkplane(cq.Workplane):
+    """
+    a Workplane that records the material its holes and cuts would remove instead of removing it right away
+    (hole(), cboreHole(), cskHole(), cutEach(), cutBlind(), cutThruAll() and cuts via combine="cut")
+    then finalize() cuts all of those tools out in a single boolean
+    face selections (for placing workplanes) see the part as it is before the recorded cuts,
+    anything that needs the real geometry (edge/vertex selections on the part, fillets, chamfers, unions,
+    findSolid() etc.) finalizes first
+    """
 
-        wp = cq.Workplane("XY")
+    _deferred: tuple = ()  # tool solids waiting to be cut out
 
-        shape = wp.union(b).union(c1).union(c2).union(c3).union(c4)
-        shape = shape.translate((-length / 2, -width / 2))
-        shape = shape.rotate((0, 0, 0), (0, 0, 1), angle)
+    def newObject(self, objlist):
+        ns = super().newObject(objlist)
+        ns._deferred = self._deferred
+        return ns
 
-        face = shape.faces("<Z").faces().val()
-        slot = face.outerWire()
-        slot = slot.locate(pnt)
+    def workplane(self, *args, **kwargs):
+        # this one doesn't go through newObject()
+        ns = super().workplane(*args, **kwargs)
+        ns._deferred = self._deferred
+        return ns
 
-        return slot
+    def _defer(self, tools) -> "DeferredWorkplane":
+        """record tools (in global coordinates) for cutting later"""
+        rv = self.newObject([self._findType((cq.Solid, cq.Compound), True, True)])
+        rv._deferred = self._deferred + tuple(tools)
+        return rv
+
+    def finalize(self) -> "DeferredWorkplane":
+        """
+        cut out everything that's been recorded so far
+        faces, edges and vertices of the part that are on the stack get swapped for what became of them
+        """
+        if not self._deferred:
+            return self
+        solid = self._findType((cq.Solid, cq.Compound), True, True)
+
+        cut = BRepAlgoAPI_Cut()
+        arguments = TopTools_ListOfShape()
+        arguments.Append(solid.wrapped)
+        tools = TopTools_ListOfShape()
+        for tool in self._deferred:
+            tools.Append(tool.wrapped)
+        cut.SetArguments(arguments)
+        cut.SetTools(tools)
+        cut.Build()
+        if not cut.IsDone():
+            raise ValueError("Could not cut out the deferred features")
+        upgrader = ShapeUpgrade_UnifySameDomain(cut.Shape(), True, True, True)
+        upgrader.Build()
+        result = cq.Shape.cast(upgrader.Shape())
+
+        def _became(shape: cq.Shape) -> list[cq.Shape]:
+            """what shape (a part of solid) turned into"""
+            after_cut = [s for s in cut.Modified(shape.wrapped)] or ([] if cut.IsDeleted(shape.wrapped) else [shape.wrapped])
+            after_clean = []
+            for s in after_cut:
+                after_clean.extend(upgrader.History().Modified(s) or ([] if upgrader.History().IsRemoved(s) else [s]))
+            unique: list[cq.Shape] = []
+            for s in after_clean:
+                if not any(s.IsSame(u.wrapped) for u in unique):
+                    unique.append(cq.Shape.cast(s))
+            return unique
+
+        rv = self.newObject([result])
+        rv._deferred = ()
+        if any(isinstance(o, (cq.Face, cq.Edge, cq.Vertex)) for o in self.objects):
+            stack = []
+            for o in self.objects:
+                if o is solid:
+                    stack.append(result)
+                elif isinstance(o, (cq.Face, cq.Edge, cq.Vertex)):
+                    stack.extend(_became(o))
+                else:
+                    stack.append(o)
+            rv = rv.newObject(stack)
+        return rv
+
+    def largestDimension(self) -> float:
+        # the recorded cuts can't make the part bigger
+        return self._findType((cq.Solid, cq.Compound), True, True).BoundingBox().DiagonalLength
+
+    def cutEach(self, fcn, useLocalCoords=False, clean=True):
+        return self._defer(self.eachpoint(fcn, useLocalCoords, combine=False).vals())
+
+    def _cutFromBase(self, obj):
+        return self._defer([obj])
+
+    def _combineWithBase(self, obj, mode=True, clean=False):
+        if mode in ("cut", "s"):
+            return self._defer([obj] if isinstance(obj, cq.Shape) else obj)
+        elif mode:
+            return cq.Workplane._combineWithBase(self.finalize(), obj, mode, clean)
+        ns = super()._combineWithBase(obj, mode, clean)
+        if any(isinstance(o, (cq.Solid, cq.Compound)) for o in ns.objects):
+            ns._deferred = ()  # new, separate solids, which none of the recorded cuts are for
+        return ns
+
+    def cutBlind(self, until, clean=True, both=False, taper=None):
+        if isinstance(until, (int, float)):
+            return self._defer([self._extrude(until, both=both, taper=taper, upToFace=None, additive=False)])
+        return cq.Workplane.cutBlind(self.finalize(), until, clean=clean, both=both, taper=taper)
+
+    def cutThruAll(self, clean=True, taper=0):
+        if taper != 0:
+            return cq.Workplane.cutThruAll(self.finalize(), clean=clean, taper=taper)
+        reach = self.largestDimension()
+        tools = []
+        for face in self._getFaces():
+            normal = face.normalAt()
+            tools.append(cq.Solid.extrudeLinear(face.translate(normal * -reach), normal * (2 * reach)))
+        return self._defer(tools)
+
+    def _selectObjects(self, objType, selector=None, tag=None):
+        if (objType != "Faces") and self._deferred and any(isinstance(o, (cq.Solid, cq.Compound, cq.Shell, cq.Face)) for o in (self._getTagged(tag) if tag else self).objects):
+            return cq.Workplane._selectObjects(self.finalize(), objType, selector, tag)
+        return super()._selectObjects(objType, selector, tag)
+
+    def findSolid(self, *args, **kwargs):
+        return cq.Workplane.findSolid(self.finalize(), *args, **kwargs)
+
+    def _fuseWithBase(self, obj):
+        return cq.Workplane._fuseWithBase(self.finalize(), obj)
+
+    def union(self, *args, **kwargs):
+        return cq.Workplane.union(self.finalize(), *args, **kwargs)
+
+    def cut(self, *args, **kwargs):
+        return cq.Workplane.cut(self.finalize(), *args, **kwargs)
+
+    def intersect(self, *args, **kwargs):
+        return cq.Workplane.intersect(self.finalize(), *args, **kwargs)
+
+    def fillet(self, *args, **kwargs):
+        return cq.Workplane.fillet(self.finalize(), *args, **kwargs)
+
+    def chamfer(self, *args, **kwargs):
+        return cq.Workplane.chamfer(self.finalize(), *args, **kwargs)
+
+    def shell(self, *args, **kwargs):
+        return cq.Workplane.shell(self.finalize(), *args, **kwargs)
+
+    def split(self, *args, **kwargs):
+        return cq.Workplane.split(self.finalize(), *args, **kwargs)
+
+
+def deferred(wp: cq.Workplane) -> DeferredWorkplane:
+    """continue wp's chain with its cuts deferred (see DeferredWorkplane)"""
+    rv = DeferredWorkplane()
+    rv.plane = wp.plane
+    rv.parent = wp
+    rv.objects = list(wp.objects)
+    rv.ctx = wp.ctx
+    return rv
+
+
+@functools.lru_cache(maxsize=None)
+def parse_selector(selector: str) -> cq.selectors.StringSyntaxSelector:
+    """a selector string parsed only once per process (the selector objects hold no state of their own)"""
+    return cq.selectors.StringSyntaxSelector(selector)
+
+
+def _cached_select_objects(self, objType, selector=None, tag=None):
+    """cq.Workplane._selectObjects, but remembering its results (see cache_selections())"""
+    cq_obj = self._getTagged(tag) if tag else self
+    if not isinstance(selector, str) or not all(isinstance(o, cq.Shape) for o in cq_obj.objects):
+        return _uncached_select_objects(self, objType, parse_selector(selector) if isinstance(selector, str) else selector, tag)
+
+    key = (tuple(cq_obj.objects), objType, selector)
+    if key in selection_cache:
+        selection_cache.move_to_end(key)
+    else:
+        selection_cache[key] = parse_selector(selector).filter(cq_obj._collectProperty(objType))
+        if len(selection_cache) > selection_cache_size:
+            selection_cache.popitem(last=False)
+    return self.newObject(list(selection_cache[key]))
+
+
+_uncached_select_objects = cq.Workplane._selectObjects
+
+
+class _SelectionCaching(object):
+    """what cache_selections() gives back, leaving a with block puts selection caching back how it was"""
+
+    def __init__(self, enable: bool):
+        self._was = cq.Workplane._selectObjects
+        _set_selection_caching(enable)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        _set_selection_caching(self._was is _cached_select_objects)
+        return False
 
-    return self.eachpoint(_makeundercut, True)
+
+def _set_selection_caching(enable: bool):
+    cq.Workplane._selectObjects = _cached_select_objects if enable else _uncached_select_objects
+    if not enable:
+        selection_cache.clear()
+
+
+def cache_selections(enable: bool = True) -> _SelectionCaching:
+    """
+    have every Workplane's faces(), edges(), vertices() etc. parse each selector string only once
+    and remember what it selected on a given set of shapes, so the same selection on an unchanged solid
+    skips the sorting and filtering
+    this patches cq.Workplane for the whole process, so either turn it off again with cache_selections(False)
+    or use it as a context manager: with cache_selections(): ... only caches inside the with block
+    """
+    return _SelectionCaching(enable)
 
 
 def multiMirror(self, mirrorPlane="XY", basePointVector=(0, 0, 0)):
-    """Just like mirror only works on multiple objects"""
-    return self.newObject([o.mirror(mirrorPlane, basePointVector) for o in self.objects])
+    """Just like mirror only works on multiple objects (they all get mirrored in one go)"""
+    mirrored = cq.Compound.makeCompound(self.objects).mirror(mirrorPlane, basePointVector)
+    return self.newObject(list(mirrored))
+
+
+def to_locations(placements) -> list[cq.Location]:
+    """
+    converts an array of placements into Locations
+    placements can be (N, 2) or (N, 3) translations or (N, 4, 4) homogeneous rigid transformation matrices
+    """
+    placements = np.asarray(placements, dtype=float)
+    if placements.ndim == 3:
+        locs = []
+        for matrix in placements:
+            trsf = gp_Trsf()
+            trsf.SetValues(*matrix[:3].flatten())
+            locs.append(cq.Location(trsf))
+        return locs
+    elif placements.shape[-1] == 2:
+        placements = np.column_stack((placements, np.zeros(len(placements))))
+    return [cq.Location(cq.Vector(*offset)) for offset in placements.tolist()]
+
+
+def place(shape: cq.Shape, placements) -> cq.Compound:
+    """
+    puts shape at every one of placements (see to_locations()) in one compound
+    the instances are just located copies of shape that all share its geometry, so nothing gets rebuilt
+    and the whole batch can go into a single boolean, e.g. wp.cut(place(hole, points))
+    """
+    return cq.Compound.makeCompound([shape.moved(loc) for loc in to_locations(placements)])
 
 
 def set_directories(wd_filename="assemble_system.py"):
@@ -132,44 +485,199 @@ def export_step(to_export, file: pathlib.Path):
         logger.info(f"Exported {file}")
 
 
-def import_step(file):
+def get_cache_dir(kind: str) -> pathlib.Path:
+    """returns (and makes if needed) the on-disk cache folder for a kind of cached thing"""
+    this_dir = cache_dir / kind
+    this_dir.mkdir(parents=True, exist_ok=True)
+    return this_dir
+
+
+def _step_key(file: pathlib.Path) -> tuple[str, int, int]:
+    """the key a STEP file is cached under, changes whenever the file does"""
+    st = file.stat()
+    return (str(file.resolve()), st.st_mtime_ns, st.st_size)
+
+
+def _step_bin_file(key: tuple[str, int, int]) -> pathlib.Path:
+    """where the binary BREP conversion of a STEP file lives on disk"""
+    digest = hashlib.sha1("|".join(str(k) for k in key).encode()).hexdigest()
+    return get_cache_dir("step") / f"{digest}.bin"
+
+
+def _read_step_bin(bin_file: pathlib.Path) -> list[cq.Shape]:
+    """loads the shapes of a STEP file back from its binary BREP conversion"""
+    return list(cq.Shape.importBin(str(bin_file)))
+
+
+def _write_step_bin(bin_file: pathlib.Path, shapes: list[cq.Shape]):
+    """stores the shapes of a STEP file (wrapped in a compound) as a binary BREP for fast loading later"""
+    tmp_file = bin_file.with_suffix(f".{os.getpid()}.tmp")
+    cq.Compound.makeCompound(shapes).exportBin(str(tmp_file))
+    tmp_file.replace(bin_file)  # so that parallel builds never see a half written file
+
+
+def _own_handles(shapes: list[cq.Shape]) -> list[cq.Shape]:
+    """new handles on cached shapes (sharing their geometry), so moving or locating them leaves the cache alone"""
+    return [cq.Shape.cast(shape.wrapped.Located(shape.wrapped.Location())) for shape in shapes]
+
+
+def import_step(file, use_cache=True, proxy=None):
+    """
+    import a STEP file as a workplane
+    unless use_cache is False, the shapes are memoized for this process and their binary BREP
+    conversion is kept in the on-disk cache so that later runs don't need to parse the STEP file
+    proxy can be "obb", "hull" or "revolve" to get a simplified stand-in for the component instead
+    (see components.make_proxy), it defaults to proxy_mode
+    """
+    if proxy is None:
+        proxy = proxy_mode
     wp = None
     if file.is_file():
-        wp = cq.importers.importStep(str(file))
-        logger.info(f"Imported {file}")
+        if proxy:
+            from . import components
+
+            wp = cq.Workplane("XY").newObject([components.make_proxy(file, proxy)])
+        elif use_cache:
+            key = _step_key(file)
+            if key not in step_cache:
+                bin_file = _step_bin_file(key)
+                if bin_file.is_file():
+                    step_cache[key] = _read_step_bin(bin_file)
+                    logger.info(f"Imported {file} (from {bin_file})")
+                else:
+                    step_cache[key] = cq.importers.importStep(str(file)).vals()
+                    _write_step_bin(bin_file, step_cache[key])
+                    logger.info(f"Imported {file}")
+            wp = cq.Workplane("XY").newObject(_own_handles(step_cache[key]))
+        else:
+            wp = cq.importers.importStep(str(file))
+            logger.info(f"Imported {file}")
     else:
-        logger.warn(f"Failed to import {file}")
+        logger.warning(f"Failed to import {file}")
     return wp
 
 
+def _parse_step(file: pathlib.Path, bin_file: pathlib.Path) -> list[cq.Shape]:
+    """process pool worker for import_steps, parses a STEP file and stores its binary BREP"""
+    shapes = cq.importers.importStep(str(file)).vals()
+    _write_step_bin(bin_file, shapes)
+    return shapes
+
+
+def import_steps(files, nparallel=None):
+    """
+    import many STEP files at once, parsing the ones that aren't cached yet in a process pool
+    returns a list of workplanes in the same order as files (with None for any that failed to import)
+    """
+    keys = {}  # file --> cache key for the files we can import
+    for file in files:
+        if file.is_file():
+            keys[file] = _step_key(file)
+        else:
+            logger.warning(f"Failed to import {file}")
+
+    to_parse = {}  # cache key --> file, for everything we don't have yet
+    for file, key in keys.items():
+        if key not in step_cache:
+            bin_file = _step_bin_file(key)
+            if bin_file.is_file():
+                step_cache[key] = _read_step_bin(bin_file)
+                logger.info(f"Imported {file} (from {bin_file})")
+            else:
+                to_parse[key] = file
+
+    if len(to_parse) == 1 or nparallel == 1:  # not worth spinning up a pool for
+        for key, file in to_parse.items():
+            step_cache[key] = _parse_step(file, _step_bin_file(key))
+            logger.info(f"Imported {file}")
+    elif to_parse:
+        register_cq_helper()  # register picklers
+        with concurrent.futures.ProcessPoolExecutor(max_workers=nparallel, initializer=register_cq_helper) as executor:
+            fs = {executor.submit(_parse_step, file, _step_bin_file(key)): key for key, file in to_parse.items()}
+            for future in concurrent.futures.as_completed(fs):
+                key = fs[future]
+                step_cache[key] = future.result()
+                logger.info(f"Imported {to_parse[key]}")
+
+    return [cq.Workplane("XY").newObject(_own_handles(step_cache[keys[file]])) if file in keys else None for file in files]
+
+
+def vertex_coordinates(shape: cq.Shape) -> np.ndarray:
+    """all the vertex positions of shape as an (N, 3) array"""
+    if isinstance(shape, cq.Compound):
+        # compounds get made on the fly (e.g. by findSolid()), so it's their parts that get cached
+        parts = [vertex_coordinates(child) for child in shape]
+        return np.concatenate(parts) if parts else np.empty((0, 3))
+    if shape in vertex_cache:
+        vertex_cache.move_to_end(shape)
+    else:
+        vertex_cache[shape] = np.array([v.toTuple() for v in shape.Vertices()], dtype=float).reshape(-1, 3)
+        if len(vertex_cache) > vertex_cache_size:
+            vertex_cache.popitem(last=False)
+    return vertex_cache[shape]
+
+
+def measure_extent(shape: cq.Shape, direction, method: str = "vertex") -> float:
+    """
+    how long shape is along direction (any vector, it gets normalized)
+    method can be "vertex" (distance between the extreme vertices),
+    "bb" (the axis aligned bounding box's extent) or "obb" (the oriented bounding box's extent)
+    """
+    direction = np.asarray(cq.Vector(direction).normalized().toTuple())
+    if method == "vertex":
+        along = vertex_coordinates(shape) @ direction
+        return float(along.max() - along.min()) if len(along) else 0.0
+    elif method == "bb":
+        bb = shape.BoundingBox()
+        return float(np.abs(direction) @ (bb.xlen, bb.ylen, bb.zlen))
+    elif method == "obb":
+        obb = Bnd_OBB()
+        BRepBndLib.AddOBB_s(shape.wrapped, obb)
+        axes = np.array([obb.XDirection().Coord(), obb.YDirection().Coord(), obb.ZDirection().Coord()])
+        sizes = 2 * np.array([obb.XHSize(), obb.YHSize(), obb.ZHSize()])
+        return float(np.abs(axes @ direction) @ sizes)
+    else:
+        raise ValueError(f"Unknown measurement method: {method}")
+
+
 def find_length(thisthing, along="normal", bb_method=False):
     """
     Use distance between extreme verticies of an object to
     find its length along a coordinate direction
     along can be "X", "Y", "Z" or "normal" to use the normal to workplane direction
     """
+    directions = {"X": (1, 0, 0), "Y": (0, 1, 0), "Z": (0, 0, 1), "normal": thisthing.plane.zDir}
 
     # use the first solid
-    tt = cq.Workplane(inPlane=thisthing.plane).add(obj=thisthing.findSolid())
-
-    length = None
-    if bb_method == False:  # vertex method
-        if along == "X":
-            length = tt.vertices(">X").val().Center().x - tt.vertices("<X").val().Center().x
-        elif along == "Y":
-            length = tt.vertices(">Y").val().Center().y - tt.vertices("<Y").val().Center().y
-        elif along == "Z":
-            length = tt.vertices(">Z").val().Center().z - tt.vertices("<Z").val().Center().z
-        elif along == "normal":
-            length = tt.vertices(f">{tt.plane.zDir.toTuple()}").val().Center().dot(tt.plane.zDir) - tt.vertices(f"<{tt.plane.zDir.toTuple()}").val().Center().dot(tt.plane.zDir)
-    else:
-        s = tt.findSolid()
-        tbb = s.BoundingBox()
-        if along == "X":
-            length = tbb.xlen
-        if along == "Y":
-            length = tbb.ylen
-        if along == "Z":
-            length = tbb.zlen
-
-    return length
+    return measure_extent(thisthing.findSolid(), directions[along], method="bb" if bb_method else "vertex")
+
+
+class ThicknessProbe(object):
+    """
+    measures how thick a shape is by casting rays (lines) through it
+    the shape's faces are loaded into the intersector once, so probing many points costs
+    a curve-surface intersection per point instead of booleans against the whole part
+    """
+
+    def __init__(self, shape: cq.Shape, tol: float = 1e-6):
+        self.shape = shape
+        self._intersector = IntCurvesFace_ShapeIntersector()
+        self._intersector.Load(shape.wrapped, tol)
+
+    def hits(self, point, direction) -> np.ndarray:
+        """sorted distances along direction from point to everywhere the line through them crosses the shape's surface"""
+        line = gp_Lin(gp_Pnt(*point), gp_Dir(*direction))
+        self._intersector.Perform(line, -1e100, 1e100)
+        return np.sort([self._intersector.WParameter(i) for i in range(1, self._intersector.NbPnt() + 1)])
+
+    def thickness(self, points, direction) -> np.ndarray:
+        """
+        the shape's extent along direction through each of points (an (N,3) array-like)
+        that's the distance between the first and last surface crossings of each line (0 where it misses)
+        """
+        result = np.zeros(len(points))
+        for i, point in enumerate(points):
+            hits = self.hits(tuple(point), tuple(direction))
+            if len(hits) > 0:
+                result[i] = hits[-1] - hits[0]
+        return result
@@ -0,0 +1,135 @@
+import unittest
+from geometrics.toolbox import utilities as u
+from geometrics.toolbox import components
+
+import cadquery
+from cadquery import cq
+
+import os
+import math
+import contextlib
+import pathlib
+import tempfile
+from unittest import mock
+
+
+def isolated_caches(tmpdirname: str) -> contextlib.ExitStack:
+    """keeps what a test caches (in memory and on disk) away from every other test"""
+    stack = contextlib.ExitStack()
+    stack.enter_context(mock.patch.object(u, "cache_dir", pathlib.Path(tmpdirname) / "cache"))
+    for cache in (u.step_cache, components.indices, components.proxies, components.proxy_cache, components.proxy_faces):
+        stack.enter_context(mock.patch.dict(cache, clear=True))
+    return stack
+
+
+class ComponentsTestCase(unittest.TestCase):
+    """components testing"""
+
+    def test_proxy_swap(self):
+        tmpdirname = tempfile.mkdtemp()
+        with isolated_caches(tmpdirname):
+            stepfile = pathlib.Path(tmpdirname) / "part.step"
+            part = cq.Workplane("XY").cylinder(5, 2).union(cq.Workplane("XY").box(1, 1, 8).translate((1, 0, 0)))
+            cadquery.exporters.export(part, str(stepfile))
+
+            for kind in components.proxy_kinds:
+                proxy = u.import_step(stepfile, proxy=kind).findSolid()
+                placed = proxy.rotate((0, 0, 0), (1, 1, 0), 37).translate((3, 4, 5))
+                mirrored = placed.mirror("XY")
+                asy = cadquery.Assembly()
+                asy.add(placed, name="placed")
+                asy.add(cq.Workplane("XY").add(mirrored), name="mirrored")
+
+                components.swap_proxies(asy)
+
+                ref = part.val().rotate((0, 0, 0), (1, 1, 0), 37).translate((3, 4, 5))
+                got = asy.children[0].obj
+                self.assertAlmostEqual(got.Volume(), ref.Volume(), places=6)
+                self.assertAlmostEqual((got.Center() - ref.Center()).Length, 0, places=6)
+                got = asy.children[1].obj.val()
+                self.assertAlmostEqual((got.Center() - ref.mirror("XY").Center()).Length, 0, places=6)
+
+    def test_identical_proxies(self):
+        tmpdirname = tempfile.mkdtemp()
+        with isolated_caches(tmpdirname):
+            # two different parts with the same bounding box, so the same obb proxy
+            solid_file, hollow_file = pathlib.Path(tmpdirname) / "solid.step", pathlib.Path(tmpdirname) / "hollow.step"
+            cadquery.exporters.export(cq.Workplane("XY").box(4, 4, 4), str(solid_file))
+            cadquery.exporters.export(cq.Workplane("XY").box(4, 4, 4).faces(">Z").workplane().hole(2), str(hollow_file))
+
+            solid_proxy = components.make_proxy(solid_file)
+            hollow_proxy = components.make_proxy(hollow_file)
+            self.assertAlmostEqual(solid_proxy.Volume(), hollow_proxy.Volume(), delta=0.1)
+            components.make_proxy(solid_file)
+            self.assertEqual(len(components.proxies), 2)  # not one per call
+
+            asy = cadquery.Assembly()
+            asy.add(hollow_proxy.translate((10, 0, 0)), name="hollow")
+            asy.add(solid_proxy.translate((-10, 0, 0)), name="solid")
+            components.swap_proxies(asy)
+            self.assertAlmostEqual(asy.children[0].obj.Volume(), 64 - math.pi * 4)
+            self.assertAlmostEqual(asy.children[1].obj.Volume(), 64)
+
+            # a proxy that got cut into stays as it is, but says so
+            cut = solid_proxy.moved(cq.Location(cq.Vector(0, 0, 1))).cut(cq.Solid.makeBox(1, 1, 10, pnt=cq.Vector(-0.5, -0.5, -5)))
+            with self.assertLogs(components.logger, "WARNING"):
+                self.assertIs(components.unproxy(cut), cut)
+
+    def test_component_index(self):
+        tmpdirname = tempfile.mkdtemp()
+        folder = pathlib.Path(tmpdirname) / "components"
+        folder.mkdir()
+        cadquery.exporters.export(cq.Workplane("XY").box(1, 2, 3).translate((5, 0, 0)), str(folder / "block.step"))
+        cadquery.exporters.export(cq.Workplane("XY").sphere(1), str(folder / "ball.step"))
+        (folder / "ball.step").rename(folder / "ball.stp")
+        (folder / "notes.txt").write_text("not a component")
+
+        with isolated_caches(tmpdirname):
+            index = components.ComponentIndex(folder)
+            self.assertListEqual(sorted(index), ["ball.stp", "block.step"])
+            self.assertTrue(index.index_file.is_file())
+
+            # a second index of the same folder comes from the stored one without loading anything
+            with mock.patch.object(components.ComponentIndex, "_measure", side_effect=AssertionError("should have been indexed already")):
+                self.assertDictEqual(components.ComponentIndex(folder).entries, index.entries)
+
+            # changing a file gets it measured again
+            cadquery.exporters.export(cq.Workplane("XY").box(2, 2, 3), str(folder / "block.step"))
+            st = (folder / "block.step").stat()
+            os.utime(folder / "block.step", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            index.refresh()
+            self.assertAlmostEqual(index["block.step"].volume, 12)
+            self.assertAlmostEqual(components.ComponentIndex(folder)["block.step"].volume, 12)  # and stored
+
+            (folder / "ball.stp").unlink()
+            index.refresh()
+            self.assertNotIn("ball.stp", index)
+
+    def test_lazy_component(self):
+        tmpdirname = tempfile.mkdtemp()
+        folder = pathlib.Path(tmpdirname) / "components"
+        folder.mkdir()
+        cadquery.exporters.export(cq.Workplane("XY").box(1, 2, 3).translate((5, 0, 0)), str(folder / "block.step"))
+
+        with isolated_caches(tmpdirname):
+            components.get_component(folder / "block.step")  # index it
+
+            for use in ("cut", "export"):
+                u.step_cache.clear()
+                block = components.get_component(folder / "block.step")
+                with mock.patch.object(u, "import_step", wraps=u.import_step) as import_step:
+                    # size and placement come from the index
+                    self.assertAlmostEqual(block.bounding_box.zlen, 3)
+                    self.assertAlmostEqual(block.origin_offset.x, 5)
+                    self.assertAlmostEqual(block.volume, 6)
+                    self.assertAlmostEqual(block.placeholder().Volume(), 6)
+                    self.assertFalse(block.loaded)
+                    import_step.assert_not_called()
+
+                    if use == "cut":
+                        result = cq.Workplane("XY").box(20, 20, 1).cut(block)
+                        self.assertAlmostEqual(result.findSolid().Volume(), 400 - 2)
+                    else:
+                        cadquery.exporters.export(block, str(pathlib.Path(tmpdirname) / "out.step"))
+                    self.assertTrue(block.loaded)
+                    import_step.assert_called_once()
@@ -0,0 +1,38 @@
+import unittest
+from geometrics.toolbox import utilities as u
+from geometrics.toolbox import endblock
+
+import pathlib
+import tempfile
+import dataclasses
+from unittest import mock
+
+
+class EndblockTestCase(unittest.TestCase):
+    """endblock testing"""
+
+    def test_build_cache(self):
+        tmpdirname = tempfile.mkdtemp()
+        with mock.patch.object(u, "cache_dir", pathlib.Path(tmpdirname) / "cache"), mock.patch.dict(endblock.build_cache, clear=True):
+            first = endblock.build(adapter_width=30, horzm3s=True, align_bumps=True, special_chamfer=1.6)
+            self.assertIs(endblock.build(adapter_width=30, horzm3s=True, align_bumps=True, special_chamfer=1.6), first)  # memoized in process
+            self.assertAlmostEqual(first.width, 30 - endblock.c.pcb_thickness)
+            self.assertEqual(first.height, 19.5)
+            with self.assertRaises(dataclasses.FrozenInstanceError):
+                first.height = 20  # type: ignore[misc]
+
+            other = endblock.build(adapter_width=30, pfdowel=True, thread_length_from_bottom=5)
+            self.assertIsNone(other.csk_diameter)
+            self.assertEqual(len(list((u.cache_dir / "endblock").glob("*.bin"))), 2)
+
+            endblock.build_cache.clear()
+            from_disk = endblock.build(adapter_width=30, horzm3s=True, align_bumps=True, special_chamfer=1.6)  # now comes from the binary BREP
+            self.assertAlmostEqual(from_disk.block.findSolid().Volume(), first.solid.Volume())
+
+            # different screw dimensions make a different block, so that can't come from the disk cache
+            endblock.build_cache.clear()
+            threads = {size: dict(thread) for size, thread in endblock.c.std_screw_threads.items()}
+            threads["m3"]["close_r"] += 0.1
+            with mock.patch.object(endblock.c, "std_screw_threads", threads):
+                endblock.build(adapter_width=30, horzm3s=True, align_bumps=True, special_chamfer=1.6)
+            self.assertEqual(len(list((u.cache_dir / "endblock").glob("*.bin"))), 3)
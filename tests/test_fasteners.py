@@ -0,0 +1,29 @@
+import unittest
+from geometrics.toolbox import utilities as u
+from geometrics.toolbox import fasteners
+
+from cq_warehouse.fastener import CounterSunkScrew
+
+import pathlib
+import tempfile
+from unittest import mock
+
+
+class FastenersTestCase(unittest.TestCase):
+    """fasteners testing"""
+
+    def test_disk_cache(self):
+        tmpdirname = tempfile.mkdtemp()
+        with mock.patch.object(u, "cache_dir", pathlib.Path(tmpdirname) / "cache"), mock.patch.dict(fasteners.fastener_cache, clear=True):
+            for simple in (True, False):
+                fresh = CounterSunkScrew(size="M3-0.5", fastener_type="iso14581", length=10, simple=simple)
+                fasteners.get_fastener(CounterSunkScrew, "M3-0.5", "iso14581", length=10, simple=simple)
+                fasteners.fastener_cache.clear()  # so the next one has to come from the disk cache
+
+                with mock.patch.object(CounterSunkScrew, "exportBin", side_effect=AssertionError("should have come from the disk cache")):
+                    from_disk = fasteners.get_fastener(CounterSunkScrew, "M3-0.5", "iso14581", length=10, simple=simple)
+                self.assertAlmostEqual(from_disk.Volume(), fresh.Volume(), places=6)
+                self.assertEqual(from_disk.length, fresh.length)
+                self.assertAlmostEqual(from_disk.head_height, fresh.head_height)
+                self.assertAlmostEqual(from_disk.clearance_hole_diameters["Close"], fresh.clearance_hole_diameters["Close"])
+            self.assertEqual(len(list((u.cache_dir / "fastener").glob("*.bin"))), 2)
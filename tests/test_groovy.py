@@ -9,6 +9,7 @@ from cadquery import cq
 
 import pathlib
 import tempfile
+from unittest import mock
 
 
 class GroovyTestCase(unittest.TestCase):
@@ -64,3 +65,50 @@ class GroovyTestCase(unittest.TestCase):
         outfile = pathlib.Path(tmpdirname) / "groove.step"
         asy.add(demo_block)
         asy.save(str(outfile))  # save step
+
+    def test_oring_hardware_fidelity(self):
+        cq.Workplane.mk_groove = groovy.mk_groove
+        volumes = {}
+        for fidelity in ("full", "analytic", "centerline"):
+            asy = cadquery.Assembly()
+            block = cq.Workplane("XY").box(120, 120, 20)
+            block = block.faces(">Z").workplane(centerOption="CenterOfBoundBox").mk_groove(ring_cs=3, follow_pending_wires=False, ring_id=115, gland_x=102, gland_y=102, hardware=asy, fidelity=fidelity)
+            block = block.faces("<Z").workplane(centerOption="CenterOfBoundBox").mk_groove(ring_cs=3, follow_pending_wires=False, ring_id=115, gland_x=102, gland_y=102, hardware=asy, fidelity=fidelity)
+            rings = [child.obj.val() for child in asy.children]
+            if fidelity == "centerline":
+                self.assertTrue(all(isinstance(ring, cq.Wire) for ring in rings))
+            else:
+                volumes[fidelity] = [ring.Volume() for ring in rings]
+                self.assertAlmostEqual((rings[0].Center() - rings[1].Center()).Length, 20 - groovy.get_gland_height(3), places=6)
+
+        for full, analytic in zip(volumes["full"], volumes["analytic"]):
+            self.assertAlmostEqual(full, analytic, places=3)
+
+    def test_groove_construction(self):
+        cq.Workplane.mk_groove = groovy.mk_groove
+        sharp = cq.Wire.makePolygon([cq.Vector(*p) for p in [(0, 0, 0), (30, 0, 0), (30, 10, 0), (12, 10, 0), (12, 25, 0), (0, 25, 0)]], close=True)
+        smooth = cq.Workplane("XY").rect(30, 25).extrude(1).edges("|Z").fillet(4).faces("<Z").wires().val()
+        for path in (sharp, smooth):
+            for groove in ({"vdepth": 1}, {"ring_cs": 2}):
+                grooved = {}
+                for construction in ("offset", "sweep"):
+                    block = cq.Workplane("XY").box(60, 60, 10, centered=(True, True, False)).translate((10, 10, -10))
+                    grooved[construction] = block.faces(">Z").workplane(centerOption="ProjectedOrigin", origin=(0, 0, 0)).add(path).wires().toPending().mk_groove(**groove, construction=construction).findSolid()
+                self.assertAlmostEqual(grooved["offset"].cut(grooved["sweep"]).Volume(), 0, places=6)
+                self.assertAlmostEqual(grooved["sweep"].cut(grooved["offset"]).Volume(), 0, places=6)
+
+    def test_oring_cache(self):
+        normal = cq.Vector(0, 0, 1)
+        small, big, small_elsewhere = (cq.Wire.makeCircle(r, cq.Vector(*c), normal) for r, c in ((10, (0, 0, 0)), (20, (0, 0, 0)), (10, (50, 0, 0))))
+        with mock.patch.dict(groovy.oring_cache, clear=True), mock.patch.object(groovy, "oring_cache_size", 2):
+            first = groovy._make_oring(small, normal, 2, 0.25, fidelity="analytic")
+            moved = groovy._make_oring(small_elsewhere, normal, 2, 0.25, fidelity="analytic")  # same ring, just placed elsewhere
+            self.assertEqual(len(groovy.oring_cache), 1)
+            small_key = next(iter(groovy.oring_cache))
+            self.assertAlmostEqual(moved.Volume(), first.Volume(), places=6)
+            self.assertAlmostEqual((moved.Center() - first.Center()).Length, 50, places=6)
+
+            groovy._make_oring(big, normal, 2, 0.25, fidelity="analytic")
+            groovy._make_oring(big, normal, 3, 0.25, fidelity="analytic")
+            self.assertEqual(len(groovy.oring_cache), 2)
+            self.assertNotIn(small_key, groovy.oring_cache)  # the least recently used ring went
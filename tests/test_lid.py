@@ -0,0 +1,67 @@
+import unittest
+from unittest import mock
+from geometrics.toolbox import lid
+
+
+class LidTestCase(unittest.TestCase):
+    """lid testing"""
+
+    def test_check_variants(self):
+        variants = {
+            "length": [119, 119, 70, 119, 119],
+            "width": [119] * 5,
+            "substrate_array_l": [50] * 5,
+            "substrate_array_w": [50] * 5,
+            "oring_size": [2556308, 2556308, 2556308, 12345, 2556308],
+            "window_size": [(75, 75), None, (75, 75), (75, 75), (75, 75)],
+            "corner_bolt_style": ["countersink", "nut", "countersink", "countersink", "wingnut"],
+        }
+        checks = lid.LidAssemblyBuilder.check_variants(variants)
+        self.assertListEqual(list(checks["reason"]), ["", "", "oring_off_plate", "oring_size", "corner_bolt_style"])
+        self.assertListEqual(list(checks["feasible"]), [True, True, False, False, False])
+
+        # the same numbers the builder itself comes up with
+        builder = lid.LidAssemblyBuilder(**{name: values[1] for name, values in variants.items()})
+        builder._calculate_reusable_params()
+        self.assertAlmostEqual(checks["oring_gland_x"][1], builder.oring_gland_x)
+        self.assertAlmostEqual(checks["window_l"][1], builder.window_l)
+
+    def test_sweep(self):
+        table, assemblies = lid.LidAssemblyBuilder.sweep({"length": [70, 119], "corner_bolt_style": ["countersink", "nut"]}, width=119, substrate_array_l=50, substrate_array_w=50, window_size=(75, 75), include_hardware=False, choose=lambda row: row["corner_bolt_style"] == "nut")
+        self.assertEqual(len(table), 4)
+        self.assertListEqual([row["feasible"] for row in table], [False, False, True, True])
+        self.assertNotIn("lid_volume", table[0])  # never built
+        self.assertGreater(table[2]["lid_volume"], 0)
+        self.assertListEqual(list(assemblies), [3])
+
+    def test_part_dependencies(self):
+        # changing the o-ring only means a new groove
+        for name in ("oring_cs", "oring_id", "oring_gland_x", "oring_gland_y"):
+            self.assertIn(name, lid.LidAssemblyBuilder._build_lid.depends_on)
+            self.assertNotIn(name, lid.LidAssemblyBuilder._build_lid_plate.depends_on)
+            self.assertNotIn(name, lid.LidAssemblyBuilder._build_support.depends_on)
+            self.assertNotIn(name, lid.LidAssemblyBuilder._build_window.depends_on)
+
+    def test_part_reuse(self):
+        params = {"length": 119, "width": 119, "substrate_array_l": 50, "substrate_array_w": 50, "window_size": (75, 75), "include_hardware": False, "oring_size": 2556308}
+        names = ("_build_lid", "_build_lid_plate", "_build_support", "_build_window")
+
+        def parts(**changes):
+            builder = lid.LidAssemblyBuilder(**{**params, **changes})
+            builder._calculate_reusable_params()
+            return {name: getattr(builder, name)() for name in names}
+
+        with mock.patch.dict(lid.tb.memo.method_cache, clear=True):
+            first = parts()
+
+            # a different o-ring gets a new groove cut into the same plate, next to the same support and window
+            other_oring = parts(oring_size=152)
+            for name in ("_build_lid_plate", "_build_support", "_build_window"):
+                self.assertIs(other_oring[name], first[name])
+            self.assertIsNot(other_oring["_build_lid"], first["_build_lid"])
+
+            # a thicker lid changes everything
+            thicker = parts(lid_t=8)
+            for name in names:
+                self.assertIsNot(thicker[name], first[name])
+                self.assertIsNot(thicker[name], other_oring[name])
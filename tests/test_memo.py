@@ -0,0 +1,120 @@
+import unittest
+from geometrics.toolbox import utilities as u
+from geometrics.toolbox import memo
+
+from cadquery import cq
+
+import pathlib
+import tempfile
+from unittest import mock
+
+
+def plate(wp: cq.Workplane, center_hole: float) -> cq.Workplane:
+    wp = wp.box(40, 30, 10).edges("|Z").fillet(3).faces(">Z").workplane().rarray(6, 6, 5, 4).hole(2)
+    return wp.faces("<Z").workplane().pushPoints([(0, 0)]).hole(center_hole)
+
+
+class MemoTestCase(unittest.TestCase):
+    """memo testing"""
+
+    def test_shared_prefix(self):
+        tmpdirname = tempfile.mkdtemp()
+        with mock.patch.object(u, "cache_dir", pathlib.Path(tmpdirname) / "cache"), mock.patch.dict(memo.memo_cache, clear=True):
+            expected = [plate(cq.Workplane("XY"), d).findSolid().Volume() for d in (3, 4)]
+
+            first = plate(memo.memo(cq.Workplane("XY")), 3)
+            n_cached = len(memo.memo_cache)
+            second = plate(memo.memo(cq.Workplane("XY")), 4)
+            self.assertEqual(len(memo.memo_cache), n_cached + 1)  # only the last hole was new
+            self.assertAlmostEqual(first.findSolid().Volume(), expected[0])
+            self.assertAlmostEqual(second.findSolid().Volume(), expected[1])
+
+            memo.memo_cache.clear()
+            with mock.patch.object(memo, "disk_threshold", 0):  # everything goes to disk
+                plate(memo.memo(cq.Workplane("XY")), 3)
+                memo.memo_cache.clear()
+                from_disk = plate(memo.memo(cq.Workplane("XY")), 3)
+            self.assertAlmostEqual(from_disk.findSolid().Volume(), expected[0])
+
+            memo.memo_cache.clear()
+            with mock.patch.object(memo, "memo_cache_size", 2):
+                plate(memo.memo(cq.Workplane("XY")), 3)
+                self.assertEqual(len(memo.memo_cache), 2)  # only the most recent ones are kept in memory
+
+    def test_unkeyable(self):
+        with mock.patch.dict(memo.memo_cache, clear=True):
+            wp = memo.memo(cq.Workplane("XY")).box(1, 1, 1)
+            self.assertIsNotNone(wp._memo_key)
+            placed = wp.faces(">Z").workplane().pushPoints([(0, 0)]).cutEach(lambda loc: cq.Solid.makeBox(0.2, 0.2, 0.2).moved(loc))
+            self.assertIsNone(placed._memo_key)  # can't key a callable
+            self.assertIsNone(placed.faces(">Z")._memo_key)  # nor anything after it
+
+    def test_plugins(self):
+        def bump(self, height):
+            runs.append(height)
+            return self.faces(">Z").workplane().rect(1, 1).extrude(height)
+
+        runs = []
+        with mock.patch.dict(memo.memo_cache, clear=True), mock.patch.object(cq.Workplane, "bump", bump, create=True):  # a plugin added after memo was imported
+            first = memo.memo(cq.Workplane("XY")).box(4, 4, 4).bump(2)
+            again = memo.memo(cq.Workplane("XY")).box(4, 4, 4).bump(2)
+            self.assertEqual(runs, [2])
+            self.assertIsNotNone(again._memo_key)
+            self.assertAlmostEqual(again.findSolid().Volume(), first.findSolid().Volume())
+
+    def test_changed_code(self):
+        def small_bump(self, height):
+            return self.faces(">Z").workplane().rect(1, 1).extrude(height)
+
+        def big_bump(self, height):
+            return self.faces(">Z").workplane().rect(2, 2).extrude(height)
+
+        tmpdirname = tempfile.mkdtemp()
+        with mock.patch.object(u, "cache_dir", pathlib.Path(tmpdirname) / "cache"), mock.patch.dict(memo.memo_cache, clear=True), mock.patch.object(memo, "disk_threshold", 0):
+            with mock.patch.object(cq.Workplane, "bump", small_bump, create=True):
+                small = memo.memo(cq.Workplane("XY")).box(4, 4, 4).bump(2)
+            memo.memo_cache.clear()  # like a new run, so only the disk cache is left
+
+            with mock.patch.object(cq.Workplane, "bump", big_bump, create=True):  # the plugin got changed since
+                big = memo.memo(cq.Workplane("XY")).box(4, 4, 4).bump(2)
+            self.assertAlmostEqual(small.findSolid().Volume(), 64 + 2)
+            self.assertAlmostEqual(big.findSolid().Volume(), 64 + 8)
+
+            # but the same code does come back from the disk cache
+            memo.memo_cache.clear()
+            with mock.patch.object(cq.Workplane, "bump", small_bump, create=True), mock.patch.object(memo, "_store", side_effect=AssertionError("should have come from the disk cache")):
+                again = memo.memo(cq.Workplane("XY")).box(4, 4, 4).bump(2)
+            self.assertAlmostEqual(again.findSolid().Volume(), 64 + 2)
+
+    def test_depends_on(self):
+        with mock.patch.dict(memo.method_cache, clear=True):
+
+            class Part:
+                runs = 0
+
+                def __init__(self, size, color):
+                    self.size = size
+                    self.color = color
+
+                @memo.depends_on("size")
+                def solid(self, height):
+                    Part.runs += 1
+                    return cq.Workplane("XY").box(self.size, self.size, height)
+
+            first = Part(2, "red").solid(1)
+            self.assertIs(Part(2, "blue").solid(1), first)  # color doesn't matter
+            self.assertEqual(Part.runs, 1)
+            Part(3, "red").solid(1)
+            Part(2, "red").solid(height=2)
+            self.assertEqual(Part.runs, 3)
+            self.assertTupleEqual(Part.solid.depends_on, ("size",))
+
+            # only the most recently used results are kept
+            with mock.patch.object(memo, "method_cache_size", 1), mock.patch.dict(memo.method_cache, clear=True):
+                Part(2, "red").solid(1)
+                Part(2, "red").solid(1)
+                self.assertEqual(Part.runs, 4)
+                Part(4, "red").solid(1)
+                self.assertEqual(len(memo.method_cache), 1)
+                Part(2, "red").solid(1)  # evicted, so it runs again
+                self.assertEqual(Part.runs, 6)
@@ -0,0 +1,32 @@
+import unittest
+from geometrics.toolbox import orings
+from geometrics.toolbox import constants as c
+
+import numpy as np
+
+
+class OringsTestCase(unittest.TestCase):
+    """o-ring selection testing"""
+
+    def test_select(self):
+        ring = c.std_orings[169]
+        perimeter = np.pi * (ring["id"] + ring["cs"])  # exactly the unstretched centerline of a 169
+        selected = orings.select_orings(perimeter, min_bend_r=20, available_width=5)
+        self.assertEqual(selected[0]["size"], 169)
+        self.assertAlmostEqual(selected[0]["stretch"], 0)
+        for better, worse in zip(selected, selected[1:]):
+            self.assertLessEqual(better["stretch"], worse["stretch"])
+        for ring in selected:
+            self.assertLessEqual(ring["stretch"], c.oring_grooves["max_stretch_fraction"])
+
+        # too tight a bend or too narrow a gland rules everything out
+        self.assertEqual(orings.select_orings(perimeter, min_bend_r=1), [])
+        self.assertEqual(orings.select_orings(perimeter, available_width=1), [])
+
+    def test_evaluate_many(self):
+        perimeters = np.linspace(200, 800, 1000)
+        result = orings.evaluate(perimeters, min_bend_r=15, available_width=4)
+        self.assertEqual(result["feasible"].shape, (1000, len(c.std_orings)))
+        for i in (0, 400, 999):
+            sizes = {ring["size"] for ring in orings.select_orings(perimeters[i], 15, 4)}
+            self.assertEqual(sizes, set(orings.sizes[result["feasible"][i]].tolist()))
@@ -26,3 +26,23 @@ class ParallelTestCase(unittest.TestCase):
                     self.fail(repr(e))
                 else:
                     print(f"done with {rslt}")
+
+    @staticmethod
+    def make_assembly(size: float):
+        asy = cq.Assembly(name="hardware")
+        asy.add(cq.Workplane("XY").box(size, size, size), name="box", color=cq.Color("red"), loc=cq.Location((1, 2, 3)))
+        asy.add(cq.Solid.makeSphere(size), name="sphere", metadata={"size": size})
+        return asy
+
+    def test_parallel_assembly(self):
+        register_cq_helper()
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, initializer=register_cq_helper) as executor:
+            asy = executor.submit(ParallelTestCase.make_assembly, 2).result()
+
+        local = ParallelTestCase.make_assembly(2)
+        self.assertEqual([child.name for child in asy.children], ["box", "sphere"])
+        self.assertEqual(asy.children[0].color.toTuple(), local.children[0].color.toTuple())
+        self.assertEqual(asy.children[1].metadata, {"size": 2})
+        self.assertAlmostEqual(asy.toCompound().Volume(), local.toCompound().Volume())
+        self.assertAlmostEqual((asy.toCompound().Center() - local.toCompound().Center()).Length, 0)
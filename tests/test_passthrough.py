@@ -8,6 +8,7 @@ from cadquery import cq
 
 import pathlib
 import tempfile
+from unittest import mock
 
 
 class PassthroughTestCase(unittest.TestCase):
@@ -25,6 +26,29 @@ class PassthroughTestCase(unittest.TestCase):
         outfile = pathlib.Path(tmpdirname) / "passthrough.step"
         u.export_step(mwp, outfile)
 
+    def test_cut_negatives(self):
+        cq.Workplane.passthrough = passthrough.make_cut
+        plate = cq.Workplane("XY").box(120, 60, 25).faces(">Z").workplane(centerOption="CenterOfBoundBox")
+        points = [(-45, 0), (-15, 0), (15, 0), (45, 0)]
+
+        with mock.patch.dict(passthrough.negative_cache, clear=True):
+            together = plate.pushPoints(points).passthrough(rows=8, angle=90, kind="C")
+            self.assertEqual(len(passthrough.negative_cache), 1)  # identical connectors share one negative
+
+            # one connector at a time, each cut on its own like cutEach used to
+            one_by_one = plate
+            for point in points:
+                one_by_one = one_by_one.findSolid()
+                one_by_one = cq.Workplane("XY").add(one_by_one).faces(">Z").workplane(centerOption="CenterOfBoundBox", origin=(0, 0, 0)).pushPoints([point]).passthrough(rows=8, angle=90, kind="C")
+            self.assertEqual(len(passthrough.negative_cache), 1)
+            self.assertAlmostEqual(together.findSolid().Volume(), one_by_one.findSolid().Volume(), places=6)
+            self.assertLess(together.findSolid().Volume(), plate.findSolid().Volume())
+
+        with mock.patch.dict(passthrough.negative_cache, clear=True), mock.patch.object(passthrough, "negative_cache_size", 1):
+            plate.pushPoints(points[:1]).passthrough(rows=8, angle=90, kind="C")
+            plate.pushPoints(points[:1]).passthrough(rows=20, angle=90, kind="C")
+            self.assertListEqual([key[0] for key in passthrough.negative_cache], [20])  # only the most recent one is kept
+
     def test_oringer(self):
         """testing for an o-ring based pcb passthrough"""
         cq.Workplane.make_oringer = passthrough.make_oringer
@@ -48,6 +72,14 @@ class PassthroughTestCase(unittest.TestCase):
 
         mwp = mwp.rarray(1, 40, 1, 3).make_oringer(board_width=pt_pcb_width, board_inner_depth=inner_depth, board_outer_depth=outer_depth, pt_asy=oringer, pcb_asy=pcb, hw_asy=hardware)
 
+        # the one passthrough and pcb that got built are placed at each point
+        for asy in (oringer, pcb):
+            parts = [child.obj for child in asy.children]
+            self.assertEqual(len(parts), 3)
+            self.assertTrue(all(isinstance(part, cq.Solid) for part in parts))
+            self.assertAlmostEqual(parts[0].Volume(), parts[2].Volume(), places=6)
+            self.assertAlmostEqual((parts[2].Center() - parts[0].Center()).Length, 80, places=6)
+
         final = cadquery.Assembly(name="passthrough testing")
         final.add(mwp, name="base part")
         final.add(hardware)
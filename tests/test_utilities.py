@@ -0,0 +1,149 @@
+import unittest
+from geometrics.toolbox import utilities as u
+
+import cadquery
+from cadquery import cq
+
+import numpy as np
+import pathlib
+import tempfile
+from unittest import mock
+
+
+class UtilitiesTestCase(unittest.TestCase):
+    """utilities testing"""
+
+    def test_import_step_cache(self):
+        tmpdirname = tempfile.mkdtemp()
+        with mock.patch.object(u, "cache_dir", pathlib.Path(tmpdirname) / "cache"), mock.patch.dict(u.step_cache, clear=True):
+            stepfile = pathlib.Path(tmpdirname) / "box.step"
+            cadquery.exporters.export(cq.Workplane("XY").box(1, 2, 3), str(stepfile))
+
+            first = u.import_step(stepfile)
+            second = u.import_step(stepfile)
+            self.assertTrue(first.val().wrapped.TShape() == second.val().wrapped.TShape())  # memoized in process
+            self.assertEqual(len(list((u.cache_dir / "step").glob("*.bin"))), 1)
+
+            first.val().locate(cq.Location(cq.Vector(5, 0, 0)))  # each caller has its own handle
+            self.assertAlmostEqual(u.import_step(stepfile).val().Center().x, 0)
+
+            u.step_cache.clear()
+            from_disk = u.import_step(stepfile)  # now comes from the binary BREP
+            self.assertAlmostEqual(from_disk.findSolid().Volume(), 6)
+
+            self.assertIsNone(u.import_step(pathlib.Path(tmpdirname) / "missing.step"))
+
+    def test_import_steps(self):
+        tmpdirname = tempfile.mkdtemp()
+        with mock.patch.object(u, "cache_dir", pathlib.Path(tmpdirname) / "cache"), mock.patch.dict(u.step_cache, clear=True):
+            files = []
+            for size in (1, 2, 3):
+                files.append(pathlib.Path(tmpdirname) / f"box{size}.step")
+                cadquery.exporters.export(cq.Workplane("XY").box(size, size, size), str(files[-1]))
+            missing = pathlib.Path(tmpdirname) / "missing.step"
+
+            imported = u.import_steps([files[2], missing, files[0], files[1]], nparallel=2)  # parsed in a pool
+            self.assertIsNone(imported[1])
+            self.assertListEqual([round(wp.findSolid().Volume(), 6) for wp in (imported[0], imported[2], imported[3])], [27, 1, 8])  # in the order asked for
+            self.assertEqual(len(u.step_cache), 3)
+            self.assertEqual(len(list((u.cache_dir / "step").glob("*.bin"))), 3)
+
+            with mock.patch.object(u, "_parse_step", side_effect=AssertionError("should have been cached")):
+                again = u.import_steps(files)  # from the in-process cache
+                self.assertAlmostEqual(again[1].findSolid().Volume(), 8)
+                u.step_cache.clear()
+                from_disk = u.import_steps(files)  # from the binary BREPs
+                self.assertAlmostEqual(from_disk[2].findSolid().Volume(), 27)
+
+    def test_thickness_probe(self):
+        stepped = cq.Workplane("XY").box(20, 10, 4).faces(">Z").workplane().rect(10, 10).cutBlind(-1)
+        probe = u.ThicknessProbe(stepped.findSolid())
+        thicknesses = probe.thickness([(0, 0, 0), (8, 0, 0), (50, 0, 0)], (0, 0, 1))
+        self.assertAlmostEqual(thicknesses[0], 3)
+        self.assertAlmostEqual(thicknesses[1], 4)
+        self.assertEqual(thicknesses[2], 0)  # missed
+
+    def test_undercut_relief(self):
+        cq.Workplane.undercutRelief2D = u.undercutRelief2D
+        for kind in ("A", "B", "C"):
+            for corner_tol in (0, 0.2):
+                with mock.patch.dict(u.relief_cache, clear=True):
+                    wires = cq.Workplane("XY").rarray(20, 1, 3, 1).undercutRelief2D(10, 5, 1.5, angle=30, kind=kind, corner_tol=corner_tol).vals()
+                    self.assertEqual(len(wires), 3)
+                    self.assertEqual(len(u.relief_cache), 1)  # drawn once, placed three times
+
+                # the same outline that unioning solids gives
+                drawn = cq.Face.makeFromWires(wires[0].moved(cq.Location((20, 0, 0))))
+                reference = cq.Face.makeFromWires(u._relief_solid_outline(10, 5, 1.5, kind, corner_tol).rotate((0, 0, 0), (0, 0, 1), 30))
+                self.assertAlmostEqual(drawn.cut(reference).Area() + reference.cut(drawn).Area(), 0)
+
+        with self.assertRaises(ValueError):
+            cq.Workplane("XY").undercutRelief2D(1, 5, 1.5, kind="B")
+
+    def test_measure_extent(self):
+        box = cq.Workplane("XY").box(10, 20, 30).rotate((0, 0, 0), (0, 0, 1), 30)
+        with mock.patch.dict(u.vertex_cache, clear=True):
+            self.assertAlmostEqual(u.find_length(box, "X"), 10 * 3**0.5 / 2 + 20 / 2)
+            self.assertAlmostEqual(u.find_length(box, "Z"), 30)
+            self.assertAlmostEqual(u.find_length(box.faces(">Z").workplane(), "normal"), 30)
+            self.assertEqual(len(u.vertex_cache), 1)  # measured once
+
+        with mock.patch.dict(u.vertex_cache, clear=True), mock.patch.object(u, "vertex_cache_size", 2):
+            boxes = [cq.Solid.makeBox(1, 1, size) for size in (1, 2, 3)]
+            for shape in (boxes[0], boxes[1], boxes[0], boxes[2]):
+                u.vertex_coordinates(shape)
+            self.assertListEqual(list(u.vertex_cache), [boxes[0], boxes[2]])  # the least recently used one went
+
+        solid = box.findSolid()
+        along_side = (3**0.5 / 2, 1 / 2, 0)
+        self.assertAlmostEqual(u.measure_extent(solid, along_side), 10)
+        self.assertAlmostEqual(u.measure_extent(solid, along_side, method="obb"), 10, places=3)
+        self.assertAlmostEqual(u.measure_extent(solid, (1, 0, 0), method="bb"), u.find_length(box, "X", bb_method=True))
+
+    def test_place(self):
+        pin = cq.Solid.makeCylinder(0.5, 5)
+        placed = u.place(pin, [(0, 0), (3, 0), (0, 3)])
+        self.assertEqual(len(list(placed)), 3)
+        self.assertTrue(all(instance.wrapped.TShape() == pin.wrapped.TShape() for instance in placed))  # geometry is shared
+
+        turn = np.eye(4)
+        turn[:3, :3] = [[0, -1, 0], [1, 0, 0], [0, 0, 1]]
+        turn[:3, 3] = [1, 2, 3]
+        (loc,) = u.to_locations([turn])
+        self.assertTupleEqual(tuple(round(x, 9) for x in loc.toTuple()[0]), (1, 2, 3))
+        self.assertAlmostEqual(loc.toTuple()[1][2], 90)
+
+        plate = cq.Workplane("XY").box(10, 10, 2, centered=False).translate((-2, -2, 0))
+        self.assertAlmostEqual(plate.cut(placed).findSolid().Volume(), 100 * 2 - 3 * 2 * np.pi * 0.5**2)
+
+    def test_deferred_workplane(self):
+        def drill(wp):
+            wp = wp.faces(">Z").workplane().rarray(6, 6, 3, 3).hole(2).faces(">Z").workplane().rect(4, 4).cutBlind(-2)
+            return wp.faces(">Z").workplane().center(8, 0).rect(2, 2).cutThruAll().edges("|Z").chamfer(0.5)
+
+        plain = drill(cq.Workplane("XY").box(20, 20, 5))
+        deferred = drill(u.deferred(cq.Workplane("XY").box(20, 20, 5)))
+        self.assertIsInstance(deferred, u.DeferredWorkplane)
+        self.assertAlmostEqual(deferred.findSolid().Volume(), plain.findSolid().Volume())
+        self.assertEqual(len(deferred.findSolid().Faces()), len(plain.findSolid().Faces()))
+
+    def test_cache_selections(self):
+        u.cache_selections()
+        try:
+            u.selection_cache.clear()
+            wp = cq.Workplane("XY").box(10, 10, 10)
+            first = wp.faces(">Z")
+            self.assertIs(first.val(), wp.faces(">Z").val())  # second one came from the cache
+            self.assertEqual(len(u.selection_cache), 1)
+
+            cut = wp.faces(">Z").workplane().hole(2)  # a new solid, so a new selection
+            self.assertEqual(len(cut.faces(">Z").val().Wires()), 2)
+            self.assertEqual(len(cut.edges("|Z").vals()), 5)
+            self.assertEqual(len(u.selection_cache), 3)
+        finally:
+            u.cache_selections(False)
+        self.assertEqual(len(u.selection_cache), 0)
+
+        with u.cache_selections():
+            self.assertIs(cq.Workplane._selectObjects, u._cached_select_objects)
+        self.assertIs(cq.Workplane._selectObjects, u._uncached_select_objects)  # back how it was
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+times mk_groove's "offset" and "sweep" constructions against each other
+on the o-ring glands of the rabbit chamber walls
+"""
+
+import time
+import cadquery
+from cadquery import cq
+from geometrics.toolbox import groovy
+
+# from rabbit/build.py
+wall_outer = (119, 119)
+wall_height = 23.1 + 5 + 1.6 + 1 + 2.48 - 0.48 + 1.1 + 1.1 + 0.4
+thickness = 17
+outer_fillet = 2
+inner_fillet = 6
+o_ring_thickness = 3
+o_ring_inner_diameter = 115
+ooffset = 17
+
+
+def mk_walls() -> cq.Workplane:
+    wp = cq.Workplane("XY").sketch().rect(*wall_outer).vertices().fillet(outer_fillet).finalize().extrude(wall_height)
+    return wp.faces(">Z").workplane().rect(wall_outer[0] - 2 * thickness, wall_outer[1] - 2 * thickness).cutThruAll().edges("|Z and (not <X) and (not >X)").fillet(inner_fillet)
+
+
+def cut_glands(construction: str, repeats: int = 5) -> tuple[float, float]:
+    """best time to cut both wall glands, and the resulting volume"""
+    cq.Workplane.mk_groove = groovy.mk_groove
+    times = []
+    for _ in range(repeats):
+        wp = mk_walls()
+        hardware = cadquery.Assembly()
+        t0 = time.perf_counter()
+        wp = wp.faces(">Z").workplane(centerOption="CenterOfBoundBox").mk_groove(ring_cs=o_ring_thickness, follow_pending_wires=False, ring_id=o_ring_inner_diameter, gland_x=wall_outer[0] - ooffset, gland_y=wall_outer[1] - ooffset, hardware=hardware, construction=construction)
+        wp = wp.faces("<Z").workplane(centerOption="CenterOfBoundBox").mk_groove(ring_cs=o_ring_thickness, follow_pending_wires=False, ring_id=o_ring_inner_diameter, gland_x=wall_outer[0] - ooffset, gland_y=wall_outer[1] - ooffset, hardware=hardware, construction=construction)
+        times.append(time.perf_counter() - t0)
+    return min(times), wp.findSolid().Volume()
+
+
+if __name__ == "__main__":
+    results = {construction: cut_glands(construction) for construction in ("sweep", "offset")}
+    for construction, (seconds, volume) in results.items():
+        print(f"{construction:>6}: {seconds*1000:8.1f} ms, wall volume {volume:.4f} mm^3")
+    print(f"speedup: {results['sweep'][0] / results['offset'][0]:.2f}x")